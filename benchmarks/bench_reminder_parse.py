@@ -0,0 +1,62 @@
+# benchmarks/bench_reminder_parse.py
+"""
+Micro-benchmark for the reminder command grammar.
+
+    python benchmarks/bench_reminder_parse.py [iterations]
+
+Reports per-command parse time with a cold cache (every phrase parsed by the
+regex) and a warm cache (repeated phrases, the common case for voice input),
+plus parse_time_to_today for the clock formats we accept.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules import reminders  # noqa: E402
+
+COMMANDS = [
+    "remind me to call mom",
+    "remind me in 10 seconds to drink water",
+    "remind me in 2 minutes to check the oven",
+    "remind me in 2 hours to go to the store",
+    "remind me at 8:30 pm to take medicine",
+    "remind me at 7 am to walk the dog",
+    "remind me every day at 8 am to take medicine",
+    "remind me every monday at 7 pm to call Bob",
+    "remind me on friday at noon to have lunch with Sara",
+    "remind me next wed at 9:15 to see the dentist",
+]
+
+TIMES = ["8:30 pm", "8 pm", "08:30 pm", "07:10", "19:45", "7 am", "7:00 am", "noon"]
+
+
+def _per_call_us(fn, items, iterations, before_each=None):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        if before_each:
+            before_each()
+        for item in items:
+            fn(item)
+    elapsed = time.perf_counter() - start
+    return elapsed / (iterations * len(items)) * 1e6
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    cold = _per_call_us(reminders.parse_reminder_command, COMMANDS, iterations,
+                        before_each=reminders._parse_reminder_cached.cache_clear)
+    warm = _per_call_us(reminders.parse_reminder_command, COMMANDS, iterations)
+    clock = _per_call_us(reminders.parse_time_to_today, TIMES, iterations)
+
+    print(f"commands: {len(COMMANDS)}  iterations: {iterations}")
+    print(f"parse_reminder_command  cold cache: {cold:8.2f} us/command")
+    print(f"parse_reminder_command  warm cache: {warm:8.2f} us/command")
+    print(f"parse_time_to_today               : {clock:8.2f} us/call")
+    print(f"cache: {reminders._parse_reminder_cached.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# benchmarks/bench_reminder_sim.py
+"""
+Scheduler regression benchmark: replay months of reminders in virtual time.
+
+    python benchmarks/bench_reminder_sim.py --users 1000 --days 365
+    python benchmarks/bench_reminder_sim.py --backend sqlite
+
+Prints firings per CPU second, lateness (virtual seconds; step work is
+charged to the virtual clock, see modules/reminder_sim.py), the real time per
+scheduler step, and the number of storage writes the scheduler issued.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.reminder_sim import run_simulation  # noqa: E402
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--users", type=int, default=1000)
+    ap.add_argument("--daily", type=int, default=3, help="daily reminders per user")
+    ap.add_argument("--weekly", type=int, default=2, help="weekly reminders per user")
+    ap.add_argument("--days", type=int, default=90, help="virtual days to simulate")
+    ap.add_argument("--backend", choices=("journal", "sqlite"), default="journal")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--cost-scale", type=float, default=1.0,
+                    help="virtual seconds charged per real second of scheduler work")
+    args = ap.parse_args()
+
+    r = run_simulation(users=args.users, daily_per_user=args.daily, weekly_per_user=args.weekly,
+                       days=args.days, backend=args.backend, seed=args.seed, cost_scale=args.cost_scale)
+
+    print(f"backend={r['backend']}  users={r['users']}  reminders={r['reminders']}  "
+          f"virtual days={r['virtual_days']}")
+    print(f"firings:            {r['firings']}")
+    print(f"cpu / wall:         {r['cpu_secs']:.2f}s / {r['wall_secs']:.2f}s")
+    print(f"firings per cpu s:  {r['firings_per_cpu_sec']:.0f}")
+    print(f"lateness mean/p99/max (virtual): {r['lateness_mean'] * 1000:.3f} / "
+          f"{r['lateness_p99'] * 1000:.3f} / {r['lateness_max'] * 1000:.3f} ms")
+    print(f"step wall p99/max:  {r['step_wall_p99'] * 1000:.2f} ms / {r['step_wall_max'] * 1000:.2f} ms")
+    print(f"storage writes:     {r['storage_writes']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# benchmarks/bench_reminder_table.py
+"""
+Due scan and bulk reschedule: engine store vs ReminderEngine.table().
+
+    python benchmarks/bench_reminder_table.py [reminders]
+
+Fills one user's journal store through a ReminderEngine, then times, for a
+one-day window, the store's due_before() scan against the table's due_rows(),
+and rescheduling the due rows with per-dict datetime arithmetic against
+ReminderTable.reschedule(). Also prints the table's memory footprint.
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.reminder_store import JournalStore  # noqa: E402
+from modules.reminder_table import local_seconds  # noqa: E402
+from modules.reminders import ReminderEngine  # noqa: E402
+
+FMT = "%Y-%m-%d %H:%M:%S"
+TASKS = ["take medicine", "drink water", "call Mom", "walk the dog", "check blood pressure"]
+
+
+def _ms(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000.0, out
+
+
+def _reschedule_dicts(reminders, now):
+    """What the engine does per fired reminder: datetime steps until past now."""
+    out = []
+    for r in reminders:
+        if not r.get("repeat"):
+            continue
+        step = timedelta(days=1) if r["repeat"] == "daily" else timedelta(days=7)
+        due = datetime.strptime(r["remind_at"], FMT)
+        while due <= now:
+            due += step
+        out.append(due)
+    return out
+
+
+def _reschedule_table_ms(engine, rows, now_secs, repeat=5):
+    """reschedule() mutates the table, so each run gets a fresh one (not timed)."""
+    best = float("inf")
+    for _ in range(repeat):
+        table = engine.table()
+        t0 = time.perf_counter()
+        table.reschedule(rows, now_secs)
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000.0
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    rng = random.Random(1)
+    start = datetime(2025, 1, 1)
+    data_dir = tempfile.mkdtemp(prefix="reminder-table-")
+
+    def open_store(user_id):
+        return JournalStore(os.path.join(data_dir, "reminders.json"),
+                            os.path.join(data_dir, "reminders.journal"), fsync=False)
+
+    engine = ReminderEngine(store_factory=open_store, autostart=False)
+    reminders = []
+    for _ in range(n):
+        at = start + timedelta(minutes=rng.randrange(30 * 24 * 60))
+        repeat = rng.choice([None, "daily", f"weekly:{at.strftime('%A')}"])
+        reminders.append({"task": rng.choice(TASKS), "remind_at": at.strftime(FMT), "repeat": repeat})
+    engine.replace(reminders)
+
+    until = start + timedelta(days=1)
+    build_ms, table = _ms(engine.table)
+    store_ms, due = _ms(lambda: engine.due(until=until))
+    table_ms, rows = _ms(lambda: table.due_rows(local_seconds(until)))
+    assert len(due) == len(rows), (len(due), len(rows))
+
+    later = until + timedelta(days=10)
+    dict_ms, _ = _ms(lambda: _reschedule_dicts(due, later))
+    bulk_ms = _reschedule_table_ms(engine, rows, local_seconds(later))
+
+    print(f"reminders: {n}  due in first day: {len(rows)}")
+    print(f"engine.table()               : {build_ms:8.2f} ms")
+    print(f"due scan   store.due_before  : {store_ms:8.2f} ms")
+    print(f"due scan   table.due_rows    : {table_ms:8.3f} ms")
+    print(f"reschedule per-dict datetime : {dict_ms:8.2f} ms  (10 days late)")
+    print(f"reschedule table.reschedule  : {bulk_ms:8.3f} ms")
+    print(f"table memory                 : {table.nbytes() / 1024:8.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
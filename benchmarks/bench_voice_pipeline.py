@@ -0,0 +1,85 @@
+# benchmarks/bench_voice_pipeline.py
+"""
+Benchmark for the speech pipeline using the fake TTS backend (no network,
+no audio device needed).
+
+    python benchmarks/bench_voice_pipeline.py [utterances] [synth_ms] [play_ms_per_char] [gap_ms]
+
+Speaks a mix of short replies, repeated reminder prompts and long multi-line
+replies, one every gap_ms, waits until everything has "played", and reports
+wall time against the serial sum (synthesis + playback one after another),
+plus the pipeline counters: pieces, merges, de-duplicated and dropped items,
+synthesis requests and cache hits, and the per-piece latency percentiles
+with the reply SLO (TTS_SLO_SECS).
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules import voice  # noqa: E402
+from modules.tts_backends import FakeBackend  # noqa: E402
+
+SHORT = ["Voice turned ON.", "(beep)", "Noted.", "Contact saved.", "All notes cleared."]
+REMINDERS = ["Reminder! take medicine", "Reminder! drink water", "Reminder! call Mom"]
+LONG = ("Here are your reminders:\n" +
+        "\n".join(f"  {i}. take the blue pill after lunch (repeat=daily)" for i in range(1, 9)))
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    synth_secs = (float(sys.argv[2]) if len(sys.argv) > 2 else 150) / 1000.0
+    play_per_char = (float(sys.argv[3]) if len(sys.argv) > 3 else 2) / 1000.0
+    gap = (float(sys.argv[4]) if len(sys.argv) > 4 else 100) / 1000.0
+
+    cache_dir = tempfile.mkdtemp(prefix="tts-bench-")
+    voice.TTS_CACHE_DIR = cache_dir
+    fake = FakeBackend(synth_secs=synth_secs, synth_secs_per_char=0.0, play_secs_per_char=play_per_char)
+    voice.set_backends([fake])
+    voice.start_worker()
+
+    texts = []
+    for i in range(n):
+        if i % 10 == 9:
+            texts.append(LONG)
+        elif i % 3 == 0:
+            texts.append(REMINDERS[i % len(REMINDERS)])
+        else:
+            texts.append(SHORT[i % len(SHORT)])
+    serial = max(sum(synth_secs + play_per_char * len(t) for t in texts), gap * (n - 1))
+
+    try:
+        start = time.perf_counter()
+        for t in texts[:-1]:
+            voice.speak(t)
+            time.sleep(gap)
+        voice.speak_blocking(texts[-1], timeout=600)
+        wall = time.perf_counter() - start
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    st = voice.speech_stats()
+    cache = voice.tts_cache_stats()
+    print(f"utterances: {n}  synth: {synth_secs * 1000:.0f} ms  playback: {play_per_char * 1000:.1f} ms/char"
+          f"  gap: {gap * 1000:.0f} ms")
+    print(f"wall time        : {wall:7.2f} s")
+    print(f"serial estimate  : {serial:7.2f} s  (no cache, no overlap, no merging)")
+    q = voice.speech_queue_stats()
+    print(f"pieces queued    : {st['pieces']}  merged: {st['merged']}  "
+          f"de-duplicated: {q['deduplicated']}  dropped: {q['dropped']}")
+    print(f"synth requests   : {st['synth_requests']}  (fake backend ran {fake.syntheses})")
+    print(f"cache            : {cache['hits']} hits / {cache['misses']} misses")
+    lat = voice.speech_latency_stats()
+    for name in ("queue_wait", "synth", "time_to_audio", "total"):
+        p = lat[name]
+        print(f"{name:<17}: p50 {p['p50'] * 1000:7.1f} ms  p90 {p['p90'] * 1000:7.1f} ms"
+              f"  p99 {p['p99'] * 1000:7.1f} ms" if p["n"] else f"{name:<17}: -")
+    print(f"reply SLO        : {lat['slo_checked'] - lat['slo_missed']}/{lat['slo_checked']} within "
+          f"{lat['slo_secs']:.1f} s  errors: {lat['errors'] or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
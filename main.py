@@ -3,7 +3,7 @@
 import re
 
 from modules.memory import (
-    load_profile, save_profile,
+    load_profile, save_profile, flush_profile,
     get_name, set_name,
     get_drink, set_drink,
     get_food, set_food,
@@ -11,7 +11,7 @@ from modules.memory import (
     get_voice_enabled, set_voice_enabled,
     get_voice_rate, set_voice_rate,
     # Day 17
-    get_notes, add_note, clear_notes,
+    note_count, get_notes_page, add_note, clear_notes, search_notes,
     # Day 18
     get_contacts, add_contact, remove_contact_like, find_contact,
     clear_contacts 
@@ -19,17 +19,22 @@ from modules.memory import (
 
 from modules.reminders import (
     add_text_reminder, add_timed_reminder, add_clock_reminder,
-    add_daily_reminder, add_weekly_reminder,
-    load_reminders, clear_reminders, reminder_checker
+    add_daily_reminder, add_weekly_reminder, add_weekday_reminder,
+    parse_reminder_command, reminder_usage_hint,
+    load_reminders, clear_reminders, reminder_checker,
+    upcoming_occurrences
 )
 
 from modules.voice import (
     speak, speak_blocking, is_available, start_worker,
-    list_voices, set_voice_by_name, beep
+    list_voices, set_voice_by_name, beep, tts_cache_stats,
+    prefetch, prefetch_stats, speech_latency_stats,
+    PRIORITY_REPLY, PRIORITY_REMINDER, PRIORITY_EMERGENCY
 )
 
 from modules.stt import (
-    transcribe_online, transcribe_offline, has_offline_model,
+    transcribe_online, transcribe_offline, has_offline_model, get_offline_model,
+    preload_offline_model, offline_model_stats,
     list_input_devices, set_input_device, mic_test
 )
 
@@ -53,12 +58,12 @@ def remember(who: str, text: str):
         conversation_history = conversation_history[-20:]
 
 
-def say(profile, text):
+def say(profile, text, priority=PRIORITY_REPLY):
     """Print + speak if voice is enabled and engine available, and remember."""
     print("Buddy:", text)
     remember("Buddy", text)
     if get_voice_enabled(profile) and is_available():
-        speak(text, rate=get_voice_rate(profile))
+        speak(text, rate=get_voice_rate(profile), priority=priority)
 
 
 def greet(profile):
@@ -110,6 +115,9 @@ Commands you can try:
   Notes:
     - note that <text>
     - my notes / show notes / list notes
+    - my notes page 2
+    - search notes <words>        (best matches first)
+    - search notes <words> page 2
     - clear notes
     - clear chat memory     (clears short-term conversation history)
 
@@ -117,16 +125,22 @@ Commands you can try:
     - remind me to <task>
     - remind me in 10 seconds to <task>
     - remind me in 2 minutes to <task>
+    - remind me in 2 hours to <task>
     - remind me at 8:30 pm to <task>
+    - remind me on friday at 9 am to <task>
     - remind me every day at 8 am to <task>
     - remind me every monday at 7 pm to <task>
     - show reminders
+    - upcoming                    (what's due in the next 7 days)
+    - upcoming 3 days page 2
     - clear reminders
 
   Voice:
     - voice on / voice off
     - set voice rate 150          (range ~100-250)
     - list voices
+    - voice cache                 (speech cache hits/misses and size)
+    - voice stats                 (speech latency percentiles, errors, reply SLO)
     - set voice aria              (or jenny/sara/...)
     - speak <anything>
     - speak direct <anything>     (blocking test)
@@ -134,9 +148,10 @@ Commands you can try:
 
   Speech-to-Text:
     - listen-online 5             (record N seconds & transcribe online)
+    - offline model               (Vosk model status and memory use)
 
   Push-to-Talk:
-    - ptt on                      (then press Enter empty to talk 5s)
+    - ptt on                      (then press Enter empty to talk 5s; offline if a Vosk model is installed)
     - ptt off
 
   Microphone:
@@ -187,6 +202,72 @@ def render_reminders():
     return "\n".join(lines)
 
 
+def render_upcoming(days=7, page=1):
+    items, more = upcoming_occurrences(days=days, page=page)
+    if not items:
+        if page > 1:
+            return "No more reminders in that window."
+        return f"Nothing is due in the next {days} day(s)."
+    lines = [f"Due in the next {days} day(s) (page {page}):"]
+    for r in items:
+        if r["repeat"]:
+            lines.append(f"  {r['at']}  {r['task']}  (repeat={r['repeat']})")
+        else:
+            lines.append(f"  {r['at']}  {r['task']}")
+    if more:
+        lines.append(f"  … say 'upcoming {days} days page {page + 1}' for more.")
+    return "\n".join(lines)
+
+
+NOTES_PER_PAGE = 10
+SEARCH_RESULTS_PER_PAGE = 5
+
+def render_notes(profile, page=1):
+    total = note_count(profile)
+    if not total:
+        return "You have no notes yet."
+    chunk = get_notes_page(profile, page, NOTES_PER_PAGE)
+    if not chunk:
+        return "No more notes."
+    pages = (total + NOTES_PER_PAGE - 1) // NOTES_PER_PAGE
+    lines = [f"Your notes (page {page} of {pages}):" if pages > 1 else "Your notes:"]
+    for i, n in chunk:
+        lines.append(f"  {i}. {n.text}  ({n.added_at})")
+    if page < pages:
+        lines.append(f"  … say 'my notes page {page + 1}' for more.")
+    return "\n".join(lines)
+
+
+def render_note_search(profile, query, page=1):
+    hits, total = search_notes(profile, query, page=page, per_page=SEARCH_RESULTS_PER_PAGE)
+    if not hits:
+        if total:
+            return "No more matching notes."
+        return f"No notes match '{query}'."
+    lines = [f"Notes matching '{query}' ({total} found, page {page}):"]
+    for i, n in hits:
+        lines.append(f"  {i}. {n.text}  ({n.added_at})")
+    if page * SEARCH_RESULTS_PER_PAGE < total:
+        lines.append(f"  … say 'search notes {query} page {page + 1}' for more.")
+    return "\n".join(lines)
+
+
+def render_speech_stats():
+    st = speech_latency_stats()
+    ms = lambda v: "-" if v is None else f"{v * 1000:.0f} ms"
+    lines = [f"Speech: {st['completed']} pieces done; waiting: {st['queue_depth']['synthesis']} "
+             f"to synthesize, {st['queue_depth']['playback']} to play."]
+    for name in ("queue_wait", "synth", "time_to_audio", "total"):
+        p = st[name]
+        lines.append(f"  {name:<14} p50 {ms(p['p50'])}, p90 {ms(p['p90'])}, p99 {ms(p['p99'])}")
+    lines.append(f"  reply SLO (audio within {st['slo_secs']:.1f} s): "
+                 f"{st['slo_checked'] - st['slo_missed']}/{st['slo_checked']} met")
+    errors = dict(st["errors"], **st["backend_errors"])
+    if errors:
+        lines.append("  errors: " + ", ".join(f"{k} {v}" for k, v in sorted(errors.items())))
+    return "\n".join(lines)
+
+
 def parse_add_contact_cmd(text: str):
     """
     Parse: add contact <Name> [phone <num>] [email <addr>] [relation <rel>]
@@ -283,6 +364,18 @@ def handle_text(profile, text: str):
             return None, msg2
         return None, msg2
 
+    if low == "offline model":
+        if not has_offline_model():
+            return None, "No offline speech model installed (models/vosk-en)."
+        st = offline_model_stats()
+        if st.get("error"):
+            return None, f"Offline speech model failed to load: {st['error']}"
+        if not st["loaded"]:
+            return None, "Offline speech model is still loading."
+        mem = f"~{st['rss_bytes'] // (1024 * 1024)} MB in memory, " if st.get("rss_bytes") else ""
+        return None, (f"Offline speech model loaded in {st['load_secs']:.1f} s; "
+                      f"{mem}{st['disk_bytes'] // (1024 * 1024)} MB on disk.")
+
     # ---- System ----
     if low == "quit":
         return "quit", "Goodbye for now! Stay safe."
@@ -293,8 +386,7 @@ def handle_text(profile, text: str):
         show_profile(profile)
         return None, None
     if low == "reset my profile":
-        newp = reset_profile()
-        profile.clear(); profile.update(newp)
+        reset_profile(profile)
         return None, "Okay, I reset your profile to defaults."
 
     # ---- Voice controls ----
@@ -320,6 +412,16 @@ def handle_text(profile, text: str):
         for i, (short, locale, gender) in enumerate(voices, start=1):
             msg.append(f"  {i}. {short}  [{locale}, {gender}]")
         return None, "\n".join(msg)
+    if low == "voice cache":
+        st = tts_cache_stats()
+        pf = prefetch_stats()
+        return None, (f"Speech cache: {st['entries']} clips, {st['bytes'] // 1024} KB of "
+                      f"{st['max_bytes'] // (1024 * 1024)} MB; {st['hits']} hits, {st['misses']} misses "
+                      f"({st['hit_rate']:.0%} hit rate), {st['evictions']} evicted.\n"
+                      f"Reminder prefetch: {pf['rendered']} rendered ahead, {pf['hits']} hits, "
+                      f"{pf['misses']} misses ({pf['hit_rate']:.0%} hit rate).")
+    if low == "voice stats":
+        return None, render_speech_stats()
     if low.startswith("set voice "):
         target = t[10:].strip()
         if not target:
@@ -355,14 +457,14 @@ def handle_text(profile, text: str):
             return None, "What should I note?"
         ok = add_note(profile, content)
         return None, ("Noted. 📘" if ok else "Couldn't save that note.")
-    if low in ("my notes", "show notes", "list notes"):
-        notes = get_notes(profile)
-        if not notes:
-            return None, "You have no notes yet."
-        lines = ["Your notes:"]
-        for i, n in enumerate(notes, start=1):
-            lines.append(f"  {i}. {n['text']}  ({n['added_at']})")
-        return None, "\n".join(lines)
+    m = re.match(r"^(?:my|show|list) notes(?:\s+page\s+(\d+))?$", low)
+    if m:
+        return None, render_notes(profile, max(1, int(m.group(1) or 1)))
+    if low.startswith("search notes") or low.startswith("search my notes"):
+        m = re.match(r"^search (?:my )?notes(?:\s+for)?\s+(.+?)(?:\s+page\s+(\d+))?$", t, flags=re.IGNORECASE)
+        if not m:
+            return None, "Try: search notes <words>, e.g. search notes doctor"
+        return None, render_note_search(profile, m.group(1).strip(), max(1, int(m.group(2) or 1)))
     if low == "clear notes":
         clear_notes(profile)
         return None, "All notes cleared."
@@ -385,11 +487,7 @@ def handle_text(profile, text: str):
             return None, "No contacts yet. Add one with: add contact Mom phone +614... email mom@... relation mother"
         lines = ["Your contacts:"]
         for i, c in enumerate(cs, start=1):
-            name = c.get("name", "—")
-            phone = c.get("phone", "—")
-            email = c.get("email", "—")
-            relation = c.get("relation", "—")
-            lines.append(f"  {i}. {name}  phone={phone}  email={email}  relation={relation}")
+            lines.append(f"  {i}. {c.name}  phone={c.phone}  email={c.email}  relation={c.relation}")
         return None, "\n".join(lines)
 
     if low.startswith("remove contact like "):
@@ -409,28 +507,33 @@ def handle_text(profile, text: str):
         if len(parts) < 2:
             return None, "Usage: notify <Name> <message>"
         who, msg = parts[0].strip(), parts[1].strip()
-        c = find_contact(profile, who)
+        # sending: exact names only, so a misheard name never messages someone else
+        c = find_contact(profile, who, fuzzy=False)
         if not c:
+            near = find_contact(profile, who)
+            if near:
+                return None, f"I don't see a contact named {who}. Did you mean {near.name}? Say: notify {near.name} {msg}"
             return None, f"I don't see a contact named {who}. Add one with: add contact {who} phone <num> email <addr>"
+        who = c.name or who
         cfg = get_config()
         ch = cfg.get("DEFAULT_CHANNEL", "console").lower()
         target = None
-        if ch == "email" and c.get("email"):
-            target = c["email"]
-        elif ch == "sms" and c.get("phone"):
-            target = c["phone"]
-        elif ch == "whatsapp" and c.get("phone"):
-            target = c["phone"]
+        if ch == "email" and c.email:
+            target = c.email
+        elif ch == "sms" and c.phone:
+            target = c.phone
+        elif ch == "whatsapp" and c.phone:
+            target = c.phone
         else:
             # fallback: email > sms > whatsapp > console
-            if c.get("email") and channel_available("email"):
-                ch, target = "email", c["email"]
-            elif c.get("phone") and channel_available("sms"):
-                ch, target = "sms", c["phone"]
-            elif c.get("phone") and channel_available("whatsapp"):
-                ch, target = "whatsapp", c["phone"]
+            if c.email and channel_available("email"):
+                ch, target = "email", c.email
+            elif c.phone and channel_available("sms"):
+                ch, target = "sms", c.phone
+            elif c.phone and channel_available("whatsapp"):
+                ch, target = "whatsapp", c.phone
             else:
-                ch, target = "console", c.get("name") or who
+                ch, target = "console", who
         ok = send_message(ch, target, msg)
         return None, (f"Notified {who} via {ch}." if ok else f"Failed to notify {who} via {ch}.")
 
@@ -442,21 +545,26 @@ def handle_text(profile, text: str):
         msg_part, who_part = rest.split(" to ", 1)
         who = who_part.strip()
         msg = f"EMERGENCY: {msg_part.strip()}"
-        c = find_contact(profile, who)
+        c = find_contact(profile, who, fuzzy=False)
         if not c:
+            near = find_contact(profile, who)
+            if near:
+                return None, (f"I don't see a contact named {who}. Did you mean {near.name}? "
+                              f"Say: emergency {msg_part.strip()} to {near.name}")
             return None, f"I don't see a contact named {who}."
+        who = c.name or who
         # prefer SMS for emergency, then WhatsApp, then email, then console
-        if c.get("phone") and channel_available("sms"):
-            ok = send_message("sms", c["phone"], msg)
-            return None, ("Emergency SMS sent." if ok else "Failed to send emergency SMS.")
-        if c.get("phone") and channel_available("whatsapp"):
-            ok = send_message("whatsapp", c["phone"], msg)
-            return None, ("Emergency WhatsApp sent." if ok else "Failed to send emergency WhatsApp.")
-        if c.get("email") and channel_available("email"):
-            ok = send_message("email", c["email"], msg, subject="EMERGENCY")
-            return None, ("Emergency email sent." if ok else "Failed to send emergency email.")
+        if c.phone and channel_available("sms"):
+            ok = send_message("sms", c.phone, msg)
+            return None, (f"Emergency SMS sent to {who}." if ok else f"Failed to send emergency SMS to {who}.")
+        if c.phone and channel_available("whatsapp"):
+            ok = send_message("whatsapp", c.phone, msg)
+            return None, (f"Emergency WhatsApp sent to {who}." if ok else f"Failed to send emergency WhatsApp to {who}.")
+        if c.email and channel_available("email"):
+            ok = send_message("email", c.email, msg, subject="EMERGENCY")
+            return None, (f"Emergency email sent to {who}." if ok else f"Failed to send emergency email to {who}.")
         ok = send_message("console", who, msg)
-        return None, ("Emergency console notify shown." if ok else "Couldn't notify.")
+        return None, (f"Emergency console notify shown for {who}." if ok else "Couldn't notify.")
 
     # test notify <channel>
     if low.startswith("test notify "):
@@ -468,95 +576,41 @@ def handle_text(profile, text: str):
         return None, ("Test sent." if ok else "Test failed.")
 
     # ---- Reminders ----
-    if low.startswith("remind me every day at"):
-        parts = t.split(" ", 5)
-        if len(parts) < 6:
-            return None, "Try: remind me every day at 8 am to take medicine"
-        remainder = parts[5].strip()
-        if " to " not in remainder.lower():
-            return None, "Use 'to' before the task. Example: remind me every day at 7 am to drink water"
-        time_part, task_part = remainder.split(" to ", 1)
-        time_str = time_part.strip()
-        task = task_part.strip()
-        if not task:
-            return None, "Remind you to… what? Please say the task."
-        try:
-            when = add_daily_reminder(task, time_str)
-            return None, f"Okay! I'll remind you every day at {when[-8:]} to: {task}"
-        except Exception:
-            return None, "I couldn't read that time. Try '8:30 pm', '7 am', or '19:45'."
-
-    if low.startswith("remind me every ") and " at " in low and " to " in low:
-        try:
-            after_every = t[16:]
-            weekday, after_wd = after_every.split(" at ", 1)
-            if " to " not in after_wd.lower():
-                raise ValueError()
-            time_part, task_part = after_wd.split(" to ", 1)
-            weekday_name = weekday.strip().lower()
-            time_str = time_part.strip()
-            task = task_part.strip()
-            if not weekday_name or not time_str or not task:
-                raise ValueError()
-            when = add_weekly_reminder(task, weekday_name, time_str)
-            return None, f"Got it! I'll remind you every {weekday_name.capitalize()} at {when[-8:]} to: {task}"
-        except Exception:
-            pass
-
-    if low.startswith("remind me at"):
-        parts = t.split(" ", 3)
-        if len(parts) < 4:
-            return None, "Try: remind me at 8:30 pm to take medicine"
-        remainder = parts[3].strip()
-        if " to " not in remainder.lower():
-            return None, "Use 'to' before the task. Example: remind me at 7 am to drink water"
-        time_part, task_part = remainder.split(" to ", 1)
-        time_str = time_part.strip()
-        task = task_part.strip()
-        if not task:
-            return None, "Remind you to… what? Please say the task."
+    if low.startswith("remind me"):
+        cmd = parse_reminder_command(t)
+        if cmd is None:
+            return None, reminder_usage_hint(low)
+        task = cmd.task
+        if cmd.kind == "text":
+            add_text_reminder(task)
+            return None, f"Okay, I'll remind you to: {task} (saved)."
+        if cmd.kind == "in":
+            remind_at = add_timed_reminder(task, cmd.seconds)
+            return None, f"Okay! I’ll remind you at {remind_at} to: {task}"
         try:
-            remind_at = add_clock_reminder(task, time_str)
+            if cmd.kind == "daily":
+                when = add_daily_reminder(task, cmd.time)
+                return None, f"Okay! I'll remind you every day at {when[-8:]} to: {task}"
+            if cmd.kind == "weekly":
+                when = add_weekly_reminder(task, cmd.weekday, cmd.time)
+                return None, f"Got it! I'll remind you every {cmd.weekday.capitalize()} at {when[-8:]} to: {task}"
+            if cmd.kind == "on":
+                remind_at = add_weekday_reminder(task, cmd.weekday, cmd.time)
+                return None, f"Okay! I'll remind you on {cmd.weekday.capitalize()} at {remind_at} to: {task}"
+            remind_at = add_clock_reminder(task, cmd.time)
             return None, f"Okay! I'll remind you at {remind_at} to: {task}"
-        except Exception:
-            return None, "I couldn't read that time. Try '8:30 pm', '7 am', or '19:45'."
-
-    if low.startswith("remind me in"):
-        parts = t.split(" ", 4)
-        if len(parts) < 5:
-            return None, "Try: remind me in 10 seconds to drink water"
-        number_str = parts[3].strip()
-        rest = parts[4]
-        try:
-            number = int(number_str)
         except ValueError:
-            return None, "Please give a number, e.g., 10 seconds or 2 minutes."
-        rest_low = rest.lower()
-        if "second" in rest_low:
-            task = rest_low.replace("seconds", "").replace("second", "").replace("to", "", 1).strip()
-            if not task:
-                return None, "Remind you to… what? Please say the task."
-            remind_at = add_timed_reminder(task, number)
-            return None, f"Okay! I’ll remind you at {remind_at} to: {task}"
-        elif "minute" in rest_low:
-            task = rest_low.replace("minutes", "").replace("minute", "").replace("to", "", 1).strip()
-            if not task:
-                return None, "Remind you to… what? Please say the task."
-            remind_at = add_timed_reminder(task, number * 60)
-            return None, f"Okay! I’ll remind you at {remind_at} to: {task}"
-        else:
-            return None, "Please specify seconds or minutes. Example: remind me in 2 minutes to drink water"
-
-    if low.startswith("remind me to"):
-        task = t[11:].strip()
-        if task:
-            add_text_reminder(task)
-            return None, f"Okay, I'll remind you to: {task} (saved)."
-        else:
-            return None, "Remind you to… what? Please say the task."
+            return None, "I couldn't read that time. Try '8:30 pm', '7 am', or '19:45'."
 
     if low == "show reminders":
         return None, render_reminders()
+    if low == "upcoming" or low.startswith("upcoming "):
+        m = re.match(r"^upcoming(?:\s+(\d+)\s+days?)?(?:\s+page\s+(\d+))?$", low)
+        if not m:
+            return None, "Try: upcoming, upcoming 3 days, or upcoming 7 days page 2"
+        days = max(1, min(366, int(m.group(1) or 7)))
+        page = max(1, int(m.group(2) or 1))
+        return None, render_upcoming(days, page)
     if low == "clear reminders":
         clear_reminders()
         return None, "All reminders cleared."
@@ -603,17 +657,31 @@ profile = load_profile()
 if is_available():
     start_worker(default_rate=get_voice_rate(profile), voice_hint="sara")
 
+# Load the offline speech model in the background so push-to-talk doesn't wait for it
+preload_offline_model()
+
 # Reminder callback
+def reminder_speech(task):
+    return "Reminder! " + task
+
 def on_reminder(task):
     msg = f"⏰ Reminder: {task}"
     print(f"\n{msg}")
     beep()
     if get_voice_enabled(profile) and is_available():
-        speak("Reminder! " + task, rate=get_voice_rate(profile))
+        speak(reminder_speech(task), rate=get_voice_rate(profile), priority=PRIORITY_REMINDER)
     print("You: ", end="", flush=True)
 
+def prefetch_reminder(task):
+    # called a few minutes ahead so the prompt plays from cache when it fires
+    if get_voice_enabled(profile) and is_available():
+        prefetch(reminder_speech(task), rate=get_voice_rate(profile))
+
+def on_missed_reminder(task, times):
+    on_reminder(f"{task} (missed {times} times while I was off)")
+
 # Kick off background reminder checker
-reminder_checker(on_reminder)
+reminder_checker(on_reminder, on_missed=on_missed_reminder, prefetch=prefetch_reminder)
 
 greet(profile)
 
@@ -627,7 +695,8 @@ while True:
     # Push-to-talk: Enter on empty line → listen 5s
     if ptt_enabled and user_input.strip() == "":
         print("(PTT listening 5s...)")
-        said = transcribe_online(seconds=5)
+        said = transcribe_offline(seconds=5) if get_offline_model() is not None else transcribe_online(seconds=5)
+        heard = said or ""
         if said:
             print(f"You (voice): {said}")
             remember("You", said)
@@ -635,6 +704,7 @@ while True:
         else:
             action, message = None, "I didn’t catch that."
     else:
+        heard = user_input
         remember("You", user_input)
         action, message = handle_text(profile, user_input)
 
@@ -642,4 +712,8 @@ while True:
         say(profile, message)
         break
     if message:
-        say(profile, message)
+        # emergency confirmations jump the speech queue (and cut off chatter)
+        urgent = heard.strip().lower().startswith("emergency ")
+        say(profile, message, priority=PRIORITY_EMERGENCY if urgent else PRIORITY_REPLY)
+
+flush_profile()
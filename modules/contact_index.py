@@ -0,0 +1,177 @@
+# modules/contact_index.py
+
+# In-memory index over a profile's contact list.
+#
+#   - exact:  case-folded name -> contact dict (O(1))
+#   - prefix: a character trie over the full name and every word in it, so
+#             "jo" finds "John" and "Mary Jones"
+#   - fuzzy:  bounded edit distance for misheard speech-to-text names; only
+#             names whose length is within the bound are compared, and each
+#             comparison gives up as soon as the bound is exceeded
+#
+# The index holds references to the same Contact objects as profile.contacts
+# and is updated incrementally by add()/remove().
+
+_END = None  # trie key holding the set of names that end at a node
+
+
+def fold(name):
+    return " ".join(str(name or "").split()).casefold()
+
+
+def _name_keys(key):
+    """The full name plus every word-start suffix: 'mary jones' -> ['mary jones', 'jones']."""
+    words = key.split(" ")
+    return [" ".join(words[i:]) for i in range(len(words))]
+
+
+def bounded_distance(a, b, bound):
+    """Levenshtein distance between a and b, or bound + 1 if it exceeds bound."""
+    if abs(len(a) - len(b)) > bound:
+        return bound + 1
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, start=1):
+        cur = [i] + [0] * len(b)
+        row_min = i
+        for j, cb in enumerate(b, start=1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb))
+            if cur[j] < row_min:
+                row_min = cur[j]
+        if row_min > bound:
+            return bound + 1
+        prev = cur
+    return prev[-1]
+
+
+class ContactIndex:
+    """Exact, prefix and fuzzy lookup over a list of Contacts."""
+
+    __slots__ = ("_by_key", "_trie", "_by_len")
+
+    def __init__(self, contacts=()):
+        self._by_key = {}     # folded name -> contact
+        self._trie = {}
+        self._by_len = {}     # len(folded name) -> set of folded names
+        for c in contacts:
+            self.add(c)
+
+    def __len__(self):
+        return len(self._by_key)
+
+    # ---------- maintenance ----------
+
+    def add(self, contact):
+        key = fold(contact.name)
+        if not key:
+            return
+        self._by_key[key] = contact
+        self._by_len.setdefault(len(key), set()).add(key)
+        for k in _name_keys(key):
+            node = self._trie
+            for ch in k:
+                node = node.setdefault(ch, {})
+            node.setdefault(_END, set()).add(key)
+
+    def remove(self, contact):
+        key = fold(contact.name)
+        if self._by_key.pop(key, None) is None:
+            return
+        bucket = self._by_len.get(len(key))
+        if bucket is not None:
+            bucket.discard(key)
+            if not bucket:
+                del self._by_len[len(key)]
+        for k in _name_keys(key):
+            self._trie_discard(k, key)
+
+    def _trie_discard(self, path, key):
+        node, trail = self._trie, []
+        for ch in path:
+            trail.append((node, ch))
+            node = node.get(ch)
+            if node is None:
+                return
+        ends = node.get(_END)
+        if ends is not None:
+            ends.discard(key)
+            if not ends:
+                del node[_END]
+        # prune now-empty branches
+        for parent, ch in reversed(trail):
+            if parent[ch]:
+                break
+            del parent[ch]
+
+    def clear(self):
+        self._by_key.clear()
+        self._trie.clear()
+        self._by_len.clear()
+
+    # ---------- lookup ----------
+
+    def get(self, name):
+        return self._by_key.get(fold(name))
+
+    def prefix(self, pattern):
+        """Contacts whose name, or any word in it, starts with pattern."""
+        node = self._trie
+        for ch in fold(pattern):
+            node = node.get(ch)
+            if node is None:
+                return []
+        keys, stack = set(), [node]
+        while stack:
+            n = stack.pop()
+            for ch, child in n.items():
+                if ch is _END:
+                    keys.update(child)
+                else:
+                    stack.append(child)
+        return [self._by_key[k] for k in sorted(keys)]
+
+    def like(self, pattern):
+        """Word-prefix matches; if there are none, any name containing pattern."""
+        hits = self.prefix(pattern)
+        if hits:
+            return hits
+        pat = fold(pattern)
+        if not pat:
+            return []
+        return [c for k, c in self._by_key.items() if pat in k]
+
+    def fuzzy(self, name, max_distance=None):
+        """The single closest name within max_distance edits (default ~1 per 4 chars), else None."""
+        key = fold(name)
+        if not key:
+            return None
+        bound = max_distance if max_distance is not None else max(1, len(key) // 4)
+        best, best_d, tie = None, bound + 1, False
+        for n in range(len(key) - bound, len(key) + bound + 1):
+            for cand in self._by_len.get(n, ()):
+                d = bounded_distance(key, cand, bound)
+                if d < best_d:
+                    best, best_d, tie = cand, d, False
+                elif d == best_d and d <= bound:
+                    tie = True
+        if best is None or tie:
+            return None
+        return self._by_key[best]
+
+    def find(self, name):
+        """Best single match, in this order: exact name, unique prefix of a
+           full name, closest fuzzy match, unique prefix of a later word
+           ('jon' finds 'John' before 'Mary Jones')."""
+        c = self.get(name)
+        if c is not None:
+            return c
+        pat = fold(name)
+        hits = self.prefix(name)
+        full = [h for h in hits if fold(h.name).startswith(pat)]
+        if len(full) == 1:
+            return full[0]
+        c = self.fuzzy(name)
+        if c is not None:
+            return c
+        if len(hits) == 1:
+            return hits[0]
+        return None
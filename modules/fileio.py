@@ -0,0 +1,48 @@
+# modules/fileio.py
+import json
+import os
+
+
+def fsync_dir(path):
+    """fsync the directory containing path so a rename is durable (no-op where unsupported)."""
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except Exception:
+        return  # not supported on this platform (e.g. Windows)
+    try:
+        os.fsync(fd)
+    except Exception:
+        pass
+    finally:
+        os.close(fd)
+
+
+def read_log(path, fsync=True):
+    """Bytes of an append-only JSON-lines file (b"" if missing). A torn tail
+       from a crash mid-append is truncated away, so the next append starts
+       on a fresh line instead of being glued to the partial one."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return b""
+    if data and not data.endswith(b"\n"):
+        data = data[:data.rfind(b"\n") + 1]
+        with open(path, "r+b") as f:
+            f.truncate(len(data))
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+    return data
+
+
+def write_json_atomic(path, data):
+    """Write JSON to a temp file, fsync it, then rename over the target.
+       Readers see either the old file or the new one, never a truncated one."""
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    fsync_dir(path)
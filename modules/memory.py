@@ -1,186 +1,291 @@
+import atexit
 import json
 import os
+import threading
+from datetime import datetime
 
-PROFILE_PATH = os.path.join("data", "user_profile.json")
+from modules.contact_index import ContactIndex
+from modules.note_index import NoteIndex
+from modules.note_log import NoteLog
+from modules.fileio import write_json_atomic
+from modules.profile_model import Profile, Contact, Note, clamp_voice_rate
 
-# Keep your original keys
-DEFAULT_PROFILE = {
-    "user_name": None,
-    "favorite_drink": None,
-    "favorite_food": None,
-    "notes": [],
-    "contacts": []
-}
+PROFILE_PATH = os.path.join("data", "user_profile.json")
 
 
 def load_profile():
-    """Load user profile from JSON; create with defaults if missing/corrupt.
-       Also migrates old 'name' -> 'user_name' if present."""
+    """Load the user profile (a Profile) from JSON; create with defaults if missing.
+       Validation and schema migration happen here, once (see profile_model.py).
+       A file that cannot be parsed is moved aside (never silently overwritten)."""
     if not os.path.exists(PROFILE_PATH):
-        save_profile(DEFAULT_PROFILE)
-        return DEFAULT_PROFILE.copy()
+        fresh = Profile()
+        save_profile(fresh)
+        return fresh
 
     try:
         with open(PROFILE_PATH, "r", encoding="utf-8") as f:
             data = json.load(f)
-
-        # Ensure all expected keys exist
-        for k, v in DEFAULT_PROFILE.items():
-            data.setdefault(k, v)
-
-        # ---- Migration: if older files had "name", move it to "user_name"
-        if data.get("user_name") is None and isinstance(data.get("name"), str):
-            data["user_name"] = data["name"]
-            try:
-                del data["name"]
-            except KeyError:
-                pass
-            save_profile(data)
-        # ---- end migration
-
-        return data
+        if not isinstance(data, dict):
+            raise ValueError("profile is not a JSON object")
     except Exception:
-        # If file is broken, start fresh (don’t crash)
-        save_profile(DEFAULT_PROFILE)
-        return DEFAULT_PROFILE.copy()
+        # Keep the unreadable file for inspection and start fresh (don’t crash)
+        aside = f"{PROFILE_PATH}.corrupt-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+        try:
+            os.replace(PROFILE_PATH, aside)
+            print(f"[memory] Profile file was unreadable; moved it to {aside}")
+        except Exception:
+            pass
+        fresh = Profile()
+        save_profile(fresh)
+        return fresh
+
+    # ---- Migration: notes used to live inside the profile; move them to the note log
+    notes_moved = False
+    if "notes" in data:
+        old_notes = data.pop("notes")
+        if isinstance(old_notes, list) and old_notes:
+            _notes().extend(n for n in old_notes if isinstance(n, dict))
+        notes_moved = True
+
+    profile, changed = Profile.from_dict(data)
+    if changed or notes_moved:
+        save_profile(profile)
+        if notes_moved:
+            flush_profile()  # don't leave the notes in the file to be migrated twice
+    # ---- end migration
+
+    return profile
+
+# ---------- Write coalescing ----------
+# save_profile() only marks the profile dirty. A background timer writes it
+# SAVE_DELAY_SECS after the first unsaved change, so a burst of setters costs
+# one write. Writes go to a temp file that is renamed over PROFILE_PATH, so a
+# crash mid-write leaves the previous file intact. flush_profile() writes
+# immediately; it runs at exit and main calls it on quit. If a write fails
+# (disk full, permissions) the changes stay pending and are retried after
+# SAVE_RETRY_SECS, by the next save, or at exit.
+
+SAVE_DELAY_SECS = 1.0
+SAVE_RETRY_SECS = 30.0
+
+_save_lock = threading.Lock()    # guards _dirty_profile / _save_timer
+_write_lock = threading.Lock()   # serializes actual file writes
+_dirty_profile = None
+_save_timer = None
+_write_count = 0
+
+def _start_timer(delay):
+    """Caller holds _save_lock."""
+    global _save_timer
+    if _save_timer is None:
+        _save_timer = threading.Timer(delay, flush_profile)
+        _save_timer.daemon = True
+        _save_timer.start()
 
 def save_profile(profile):
-    """Save user profile to JSON file."""
-    with open(PROFILE_PATH, "w", encoding="utf-8") as f:
-        json.dump(profile, f, ensure_ascii=False, indent=2)
+    """Schedule the profile to be written (coalesced with other changes)."""
+    global _dirty_profile
+    with _save_lock:
+        _dirty_profile = profile
+        _start_timer(SAVE_DELAY_SECS)
+
+def flush_profile():
+    """Write any pending profile changes now. Returns True if something was written."""
+    global _dirty_profile, _save_timer, _write_count
+    with _write_lock:
+        with _save_lock:
+            profile, _dirty_profile = _dirty_profile, None
+            if _save_timer is not None:
+                _save_timer.cancel()
+                _save_timer = None
+        if profile is None:
+            return False
+        try:
+            write_json_atomic(PROFILE_PATH, profile.to_dict())
+        except Exception as e:
+            print(f"[memory] Could not save profile (will retry): {e}")
+            with _save_lock:
+                if _dirty_profile is None:
+                    _dirty_profile = profile  # keep the changes pending
+                _start_timer(SAVE_RETRY_SECS)
+            return False
+        _write_count += 1
+        return True
+
+def profile_write_count():
+    """Number of profile file writes since start (for diagnostics)."""
+    return _write_count
+
+atexit.register(flush_profile)
 
 # ---------- Helper functions (module-level; importable) ----------
 
 def get_name(profile):
-    return profile.get("user_name")
+    return profile.user_name
 
 def set_name(profile, name: str):
-    profile["user_name"] = name.strip().title() if name else None
+    profile.user_name = name.strip().title() if name else None
     save_profile(profile)
 
 def get_drink(profile):
-    return profile.get("favorite_drink")
+    return profile.favorite_drink
 
 def set_drink(profile, drink: str):
-    profile["favorite_drink"] = drink.strip() if drink else None
+    profile.favorite_drink = drink.strip() if drink else None
     save_profile(profile)
 
 def get_food(profile):
-    return profile.get("favorite_food")
+    return profile.favorite_food
 
 def set_food(profile, food: str):
-    profile["favorite_food"] = food.strip() if food else None
+    profile.favorite_food = food.strip() if food else None
     save_profile(profile)
 
-def reset_profile():
-    """Clear everything back to defaults and save."""
-    fresh = DEFAULT_PROFILE.copy()
-    save_profile(fresh)
-    return fresh
+def reset_profile(profile=None):
+    """Clear everything back to defaults (notes included) and save.
+       Resets `profile` in place when given, else returns a new Profile."""
+    if profile is None:
+        profile = Profile()
+    else:
+        profile.reset()
+    clear_notes(profile)
+    save_profile(profile)
+    return profile
 
 def get_voice_enabled(profile):
-    v = profile.get("voice_enabled")
-    if v is None:
-        profile["voice_enabled"] = True
-        save_profile(profile)
-        return True
-    return bool(v)
+    return profile.voice_enabled
 
 def set_voice_enabled(profile, enabled: bool):
-    profile["voice_enabled"] = bool(enabled)
+    profile.voice_enabled = bool(enabled)
     save_profile(profile)
 
 def get_voice_rate(profile):
-    r = profile.get("voice_rate")
-    if not isinstance(r, int):
-        profile["voice_rate"] = 170
-        save_profile(profile)
-        return 170
-    return r
+    return profile.voice_rate
 
 def set_voice_rate(profile, rate: int):
-    try:
-        r = int(rate)
-    except Exception:
-        r = 170
-    profile["voice_rate"] = max(100, min(250, r))  # clamp: 100–250
+    profile.voice_rate = clamp_voice_rate(rate)  # clamp: 100–250
     save_profile(profile)
 
-from datetime import datetime
+# ---------- Notes ----------
+# Notes live in their own append-only log under NOTES_DIR (see note_log.py),
+# not in the profile JSON, so startup and every profile write stay the same
+# size however many notes pile up. The log is opened on first use; the search
+# index is built the first time someone searches and then kept up to date.
+# The profile argument is kept so call sites don't change.
+
+NOTES_DIR = os.path.join("data", "notes")
+
+_notes_lock = threading.Lock()
+_note_log = None
+_note_search = None
+
+def _notes():
+    global _note_log
+    with _notes_lock:
+        if _note_log is None:
+            _note_log = NoteLog(NOTES_DIR)
+        return _note_log
+
+def note_count(profile):
+    return len(_notes())
+
+def get_notes_page(profile, page: int = 1, per_page: int = 10):
+    """One page of notes, oldest first, as [(note number, Note), ...] (1-based)."""
+    start = (max(1, int(page)) - 1) * per_page
+    return list(enumerate(map(Note.from_dict, _notes().page(start, per_page)), start=start + 1))
 
 def get_notes(profile):
-    # Always return a list
-    notes = profile.get("notes")
-    if not isinstance(notes, list):
-        notes = []
-        profile["notes"] = notes
-        save_profile(profile)
-    return notes
+    """Every note as a list of Note (reads the whole log; prefer get_notes_page)."""
+    return [Note.from_dict(n) for n in _notes()]
 
 def add_note(profile, text: str):
     text = (text or "").strip()
     if not text:
         return False
     # store timestamped note; simple dict to allow future expansion
-    note = {
-        "text": text,
-        "added_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    }
-    notes = get_notes(profile)
-    notes.append(note)
-    save_profile(profile)
+    note = Note(text, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+    try:
+        number = _notes().append(note.to_dict())
+    except Exception as e:
+        print(f"[memory] Could not save note: {e}")
+        return False
+    if _note_search is not None:
+        _note_search.add(number, text)
     return True
 
 def clear_notes(profile):
-    profile["notes"] = []
-    save_profile(profile)
+    global _note_search
+    _notes().clear()
+    _note_search = None
     return True
 
+def search_notes(profile, query: str, page: int = 1, per_page: int = 5):
+    """Best-matching notes for query, one page at a time.
+       Returns ([(note number, Note), ...], total matches); numbers are 1-based
+       like 'my notes'."""
+    global _note_search
+    log = _notes()
+    if _note_search is None:
+        _note_search = NoteIndex((i, n.get("text", "")) for i, n in enumerate(log) if isinstance(n, dict))
+    hits, total = _note_search.search(query, page=page, per_page=per_page)
+    return [(i + 1, Note.from_dict(log.get(i))) for i, _score in hits], total
+
 def get_contacts(profile):
-    contacts = profile.get("contacts")
-    if not isinstance(contacts, list):
-        contacts = []
-        profile["contacts"] = contacts
-        save_profile(profile)
-    return contacts
+    return profile.contacts
+
+# Contact lookups go through a ContactIndex built on first use and kept on
+# the profile (profile.contact_index); the functions below update it together
+# with profile.contacts.
+
+def _contact_index(profile):
+    index = profile.contact_index
+    if index is None:
+        index = profile.contact_index = ContactIndex(profile.contacts)
+    return index
 
 def add_contact(profile, name: str, phone: str | None = None, email: str | None = None, relation: str | None = None):
     name = (name or "").strip()
     if not name:
         return False
-    contacts = get_contacts(profile)
+    index = _contact_index(profile)
     # replace if same name exists
-    for c in contacts:
-        if c.get("name","").lower() == name.lower():
-            c.update({"phone": phone, "email": email, "relation": relation})
-            save_profile(profile)
-            return True
-    contacts.append({"name": name, "phone": phone, "email": email, "relation": relation})
+    c = index.get(name)
+    if c is not None:
+        c.phone, c.email, c.relation = phone, email, relation
+        save_profile(profile)
+        return True
+    c = Contact(name, phone, email, relation)
+    profile.contacts.append(c)
+    index.add(c)
     save_profile(profile)
     return True
 
 def remove_contact_like(profile, pattern: str):
-    pat = (pattern or "").strip().lower()
-    if not pat:
+    """Remove contacts whose name (or a word in it) starts with pattern;
+       if none do, those whose name contains it."""
+    if not (pattern or "").strip():
         return False
-    contacts = get_contacts(profile)
-    new_list = [c for c in contacts if pat not in str(c.get("name","")).lower()]
-    if len(new_list) == len(contacts):
+    index = _contact_index(profile)
+    matches = index.like(pattern)
+    if not matches:
         return False
-    profile["contacts"] = new_list
+    gone = {id(c) for c in matches}
+    profile.contacts[:] = [c for c in profile.contacts if id(c) not in gone]
+    for c in matches:
+        index.remove(c)
     save_profile(profile)
     return True
 
-def find_contact(profile, name: str):
-    name = (name or "").strip()
-    for c in get_contacts(profile):
-        if c.get("name","").lower() == name.lower():
-            return c
-    return None
+def find_contact(profile, name: str, fuzzy: bool = True):
+    """Exact (case-insensitive) match; with fuzzy=True also a unique prefix
+       or near-miss spelling (e.g. a misheard 'Jon' for 'John')."""
+    index = _contact_index(profile)
+    if not fuzzy:
+        return index.get(name)
+    return index.find(name)
 
 def clear_contacts(profile):
-    profile["contacts"] = []
+    profile.contacts.clear()
+    _contact_index(profile).clear()
     save_profile(profile)
     return True
-
-
@@ -0,0 +1,79 @@
+# modules/note_index.py
+import heapq
+import math
+import re
+
+# Inverted index over notes, ranked with Okapi BM25.
+#
+#   postings: term -> {note id: term frequency}
+#   lengths:  note id -> number of terms in the note
+#
+# Notes are only ever appended (or cleared all at once), so add() is the only
+# update; a search touches just the postings of the query terms rather than
+# every note.
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+K1 = 1.2
+B = 0.75
+
+
+def tokenize(text):
+    return _TOKEN_RE.findall(str(text or "").casefold())
+
+
+class NoteIndex:
+    """Incremental BM25 search over (note id, text) pairs."""
+
+    __slots__ = ("_postings", "_lengths", "_total_len")
+
+    def __init__(self, notes=()):
+        self._postings = {}
+        self._lengths = {}
+        self._total_len = 0
+        for note_id, text in notes:
+            self.add(note_id, text)
+
+    def __len__(self):
+        return len(self._lengths)
+
+    def add(self, note_id, text):
+        terms = tokenize(text)
+        if note_id in self._lengths:
+            return
+        self._lengths[note_id] = len(terms)
+        self._total_len += len(terms)
+        tf = {}
+        for t in terms:
+            tf[t] = tf.get(t, 0) + 1
+        for t, n in tf.items():
+            self._postings.setdefault(t, {})[note_id] = n
+
+    def clear(self):
+        self._postings.clear()
+        self._lengths.clear()
+        self._total_len = 0
+
+    def _scores(self, query):
+        n_docs = len(self._lengths)
+        if not n_docs:
+            return {}
+        avg_len = self._total_len / n_docs or 1.0
+        scores = {}
+        for t in set(tokenize(query)):
+            posting = self._postings.get(t)
+            if not posting:
+                continue
+            idf = math.log(1.0 + (n_docs - len(posting) + 0.5) / (len(posting) + 0.5))
+            for note_id, tf in posting.items():
+                norm = tf + K1 * (1.0 - B + B * self._lengths[note_id] / avg_len)
+                scores[note_id] = scores.get(note_id, 0.0) + idf * tf * (K1 + 1.0) / norm
+        return scores
+
+    def search(self, query, page=1, per_page=5):
+        """Returns ([(note id, score), ...] for the page, total matches), best first;
+           ties go to the newer note."""
+        scores = self._scores(query)
+        page = max(1, int(page))
+        top = heapq.nlargest(page * per_page, scores.items(), key=lambda kv: (kv[1], kv[0]))
+        return top[(page - 1) * per_page:], len(scores)
@@ -0,0 +1,128 @@
+# modules/note_log.py
+import json
+import os
+import re
+import shutil
+import threading
+from collections import OrderedDict
+
+from modules.fileio import read_log
+
+# Append-only, segmented note store.
+#
+#   data/notes/notes-000000.jsonl   notes 0 .. SEGMENT_SIZE-1, one JSON per line
+#   data/notes/notes-000001.jsonl   the next SEGMENT_SIZE notes, and so on
+#
+# Every segment but the last is full, so the note count comes from the number
+# of segment files plus the line count of the last one: opening the log reads
+# one segment at most, and a page of notes reads only the segments it spans.
+# A few decoded segments are kept in memory for paging back and forth.
+
+SEGMENT_SIZE = 500
+CACHED_SEGMENTS = 4
+
+_SEGMENT_RE = re.compile(r"^notes-(\d{6})\.jsonl$")
+
+
+class NoteLog:
+    """Notes numbered from 0 in the order they were added."""
+
+    def __init__(self, directory, segment_size=SEGMENT_SIZE, fsync=True):
+        self.directory = directory
+        self.segment_size = segment_size
+        self.fsync = fsync
+        self._lock = threading.RLock()
+        self._cache = OrderedDict()   # segment number -> list of notes
+        self._count = None            # computed on first use
+
+    def _path(self, seg):
+        return os.path.join(self.directory, f"notes-{seg:06d}.jsonl")
+
+    def _segment_numbers(self):
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted(int(m.group(1)) for m in map(_SEGMENT_RE.match, names) if m)
+
+    def _read_segment(self, seg):
+        notes = self._cache.get(seg)
+        if notes is not None:
+            self._cache.move_to_end(seg)
+            return notes
+        notes = []
+        for line in read_log(self._path(seg), fsync=self.fsync).splitlines():
+            try:
+                notes.append(json.loads(line))
+            except Exception:
+                notes.append({"text": "", "added_at": ""})  # keep numbering stable
+        self._cache[seg] = notes
+        while len(self._cache) > CACHED_SEGMENTS:
+            self._cache.popitem(last=False)
+        return notes
+
+    def __len__(self):
+        with self._lock:
+            if self._count is None:
+                segs = self._segment_numbers()
+                if not segs:
+                    self._count = 0
+                else:
+                    last = segs[-1]
+                    self._count = last * self.segment_size + len(self._read_segment(last))
+            return self._count
+
+    def append(self, note):
+        """Add a note; returns its number."""
+        with self._lock:
+            n = len(self)
+            seg = n // self.segment_size
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self._path(seg), "a", encoding="utf-8") as f:
+                f.write(json.dumps(note, ensure_ascii=False) + "\n")
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+            cached = self._cache.get(seg)
+            if cached is not None:
+                cached.append(note)
+            self._count = n + 1
+            return n
+
+    def extend(self, notes):
+        for note in notes:
+            self.append(note)
+
+    def get(self, number):
+        with self._lock:
+            if not 0 <= number < len(self):
+                raise IndexError(number)
+            seg, off = divmod(number, self.segment_size)
+            return self._read_segment(seg)[off]
+
+    def page(self, start, count):
+        """Notes start .. start+count-1 (fewer at the end of the log)."""
+        with self._lock:
+            end = min(len(self), start + count)
+            out = []
+            i = max(0, start)
+            while i < end:
+                seg, off = divmod(i, self.segment_size)
+                chunk = self._read_segment(seg)[off:off + (end - i)]
+                if not chunk:
+                    break
+                out.extend(chunk)
+                i += len(chunk)
+            return out
+
+    def __iter__(self):
+        """All notes, oldest first, one segment in memory at a time."""
+        total = len(self)
+        for start in range(0, total, self.segment_size):
+            yield from self.page(start, self.segment_size)
+
+    def clear(self):
+        with self._lock:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self._cache.clear()
+            self._count = 0
@@ -0,0 +1,144 @@
+# modules/profile_model.py
+from dataclasses import dataclass, field
+
+# Typed profile model.
+#
+# Everything that used to be repaired lazily inside the getters (missing keys,
+# wrong types, the old 'name' key, an out-of-range voice rate) is validated
+# once in Profile.from_dict() when the file is loaded. After that the fields
+# are trusted, so getters are plain attribute reads.
+#
+# The classes use __slots__ (dataclass slots=True): no per-instance __dict__,
+# which matters when one process holds many profiles and their contacts.
+#
+# On disk the profile is still a flat JSON object (to_dict()), now carrying a
+# schema_version. Keys this version doesn't know are kept in `extra` and
+# written back unchanged.
+
+SCHEMA_VERSION = 2
+
+DEFAULT_VOICE_RATE = 170
+MIN_VOICE_RATE = 100
+MAX_VOICE_RATE = 250
+
+
+def _opt_str(v):
+    if v is None:
+        return None
+    v = str(v).strip()
+    return v or None
+
+
+def clamp_voice_rate(rate):
+    try:
+        r = int(rate)
+    except Exception:
+        r = DEFAULT_VOICE_RATE
+    return max(MIN_VOICE_RATE, min(MAX_VOICE_RATE, r))
+
+
+@dataclass(slots=True)
+class Contact:
+    name: str
+    phone: str | None = None
+    email: str | None = None
+    relation: str | None = None
+
+    @classmethod
+    def from_dict(cls, d):
+        """A Contact from a stored dict, or None if it has no usable name."""
+        if not isinstance(d, dict):
+            return None
+        name = _opt_str(d.get("name"))
+        if name is None:
+            return None
+        return cls(name, _opt_str(d.get("phone")), _opt_str(d.get("email")), _opt_str(d.get("relation")))
+
+    def to_dict(self):
+        return {"name": self.name, "phone": self.phone, "email": self.email, "relation": self.relation}
+
+
+@dataclass(slots=True)
+class Note:
+    text: str
+    added_at: str = ""
+
+    @classmethod
+    def from_dict(cls, d):
+        if isinstance(d, dict):
+            return cls(str(d.get("text") or ""), str(d.get("added_at") or ""))
+        return cls(str(d or ""), "")
+
+    def to_dict(self):
+        return {"text": self.text, "added_at": self.added_at}
+
+
+@dataclass(slots=True)
+class Profile:
+    user_name: str | None = None
+    favorite_drink: str | None = None
+    favorite_food: str | None = None
+    voice_enabled: bool = True
+    voice_rate: int = DEFAULT_VOICE_RATE
+    contacts: list = field(default_factory=list)     # list[Contact]
+    extra: dict = field(default_factory=dict)        # unknown keys, passed through
+    contact_index: object = field(default=None, repr=False, compare=False)  # built by memory.py
+
+    @classmethod
+    def from_dict(cls, data):
+        """Validate/migrate a loaded JSON object. Returns (profile, changed);
+           changed is True when the stored form should be rewritten."""
+        data = dict(data)
+        version = data.pop("schema_version", 1)
+        changed = version != SCHEMA_VERSION
+
+        # v1: 'name' was renamed to 'user_name'
+        legacy_name = data.pop("name", None)
+        if legacy_name is not None:
+            changed = True
+            if data.get("user_name") is None and isinstance(legacy_name, str):
+                data["user_name"] = legacy_name
+
+        p = cls()
+        p.user_name = _opt_str(data.pop("user_name", None))
+        p.favorite_drink = _opt_str(data.pop("favorite_drink", None))
+        p.favorite_food = _opt_str(data.pop("favorite_food", None))
+
+        enabled = data.pop("voice_enabled", True)
+        p.voice_enabled = True if enabled is None else bool(enabled)
+
+        rate = data.pop("voice_rate", DEFAULT_VOICE_RATE)
+        p.voice_rate = clamp_voice_rate(rate)
+        changed = changed or p.voice_rate != rate
+
+        raw_contacts = data.pop("contacts", [])
+        if not isinstance(raw_contacts, list):
+            raw_contacts, changed = [], True
+        for d in raw_contacts:
+            c = Contact.from_dict(d)
+            if c is None:
+                changed = True
+            else:
+                p.contacts.append(c)
+
+        p.extra = data
+        return p, changed
+
+    def to_dict(self):
+        d = dict(self.extra)
+        d.update({
+            "schema_version": SCHEMA_VERSION,
+            "user_name": self.user_name,
+            "favorite_drink": self.favorite_drink,
+            "favorite_food": self.favorite_food,
+            "voice_enabled": self.voice_enabled,
+            "voice_rate": self.voice_rate,
+            "contacts": [c.to_dict() for c in self.contacts],
+        })
+        return d
+
+    def reset(self):
+        """Back to defaults, in place (callers keep their reference)."""
+        fresh = Profile()
+        for name in self.__slots__:
+            setattr(self, name, getattr(fresh, name))
@@ -0,0 +1,121 @@
+# modules/reminder_sim.py
+import os
+import random
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from modules.reminder_store import JournalStore, SqliteStore, due_epoch
+from modules.reminders import ReminderEngine, SimulatedClock, set_clock, _fmt
+from modules.stats import percentile
+
+# Drive a ReminderEngine through virtual time.
+#
+# Users and their daily/weekly reminders are generated into a throwaway data
+# directory, the global clock is replaced by a SimulatedClock, and the engine
+# is stepped (no checker thread, callbacks run inline) until the virtual end
+# date. The report is what we track as the scheduler regression benchmark:
+# firings per CPU second, lateness in virtual seconds, and storage writes.
+#
+# Waiting is free in virtual time, but work is not: the real time each step
+# spends dispatching and persisting (times cost_scale) is added to the virtual
+# clock afterwards. Reminders that come due meanwhile fire late by that much,
+# and within one step each firing is also charged the work done before its
+# dispatch, so a slower step shows up as lateness, as it would on a real clock.
+# The per-step wall time is reported as well.
+
+
+def run_simulation(users=1000, daily_per_user=3, weekly_per_user=2, days=90,
+                   backend="journal", start=None, seed=1, cost_scale=1.0):
+    """Simulate `days` of virtual time; returns a dict of metrics.
+       cost_scale: virtual seconds charged per real second of step work."""
+    rng = random.Random(seed)
+    start = start or datetime(2025, 1, 1, 0, 0, 0)
+    end = start + timedelta(days=days)
+    data_dir = tempfile.mkdtemp(prefix="reminder-sim-")
+    stores = {}
+
+    def open_store(user_id):
+        if backend == "sqlite":
+            st = SqliteStore(os.path.join(data_dir, "reminders.db"), user_id=user_id)
+        else:
+            base = os.path.join(data_dir, user_id)
+            os.makedirs(base, exist_ok=True)
+            st = JournalStore(os.path.join(base, "reminders.json"),
+                              os.path.join(base, "reminders.journal"), fsync=False)
+        stores[user_id] = st
+        return st
+
+    step_start = [0.0]
+    dispatched_at = []   # real seconds into the current step, per dispatch
+
+    def dispatch(fn, args):
+        dispatched_at.append(time.perf_counter() - step_start[0])
+        fn(*args)
+
+    def noop(*_args):
+        pass
+
+    clock = SimulatedClock(start)
+    previous = set_clock(clock)
+    try:
+        engine = ReminderEngine(store_factory=open_store, dispatch=dispatch, autostart=False)
+        for u in range(users):
+            uid = f"user{u:05d}"
+            engine.register(uid, noop, on_missed=noop)
+            for k in range(daily_per_user):
+                at = start + timedelta(minutes=rng.randrange(24 * 60))
+                engine.add({"task": f"daily task {k}", "remind_at": _fmt(at), "repeat": "daily"}, uid)
+            for k in range(weekly_per_user):
+                at = start + timedelta(minutes=rng.randrange(7 * 24 * 60))
+                engine.add({"task": f"weekly task {k}", "remind_at": _fmt(at),
+                            "repeat": f"weekly:{at.strftime('%A')}"}, uid)
+
+        setup_writes = sum(st.writes for st in stores.values())
+        lateness = []
+        step_secs = []
+        cpu0 = time.process_time()
+        wall0 = time.perf_counter()
+        while True:
+            dispatched_at.clear()
+            step_start[0] = t0 = time.perf_counter()
+            fired = engine.step(until=end)   # waiting on the simulated clock is ~free
+            took = time.perf_counter() - t0
+            if not fired:
+                if clock.now() >= end:
+                    break
+                continue
+            now = clock.now().timestamp()
+            # every fired reminder here is dispatched, in order (noop handlers)
+            offsets = dispatched_at if len(dispatched_at) == len(fired) else [0.0] * len(fired)
+            for (_uid, rem, _times), offset in zip(fired, offsets):
+                lateness.append(now - due_epoch(rem["remind_at"]) + offset * cost_scale)
+            step_secs.append(took)
+            clock.advance(took * cost_scale)
+        cpu = time.process_time() - cpu0
+        wall = time.perf_counter() - wall0
+    finally:
+        set_clock(previous)
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    lateness.sort()
+    step_secs.sort()
+    firings = len(lateness)
+    return {
+        "backend": backend,
+        "users": users,
+        "reminders": users * (daily_per_user + weekly_per_user),
+        "virtual_days": days,
+        "firings": firings,
+        "cpu_secs": cpu,
+        "wall_secs": wall,
+        "firings_per_cpu_sec": firings / cpu if cpu > 0 else 0.0,
+        "lateness_mean": (sum(lateness) / firings) if firings else 0.0,
+        "lateness_p99": percentile(lateness, 99, default=0.0),
+        "lateness_max": lateness[-1] if lateness else 0.0,
+        "step_wall_p99": percentile(step_secs, 99, default=0.0),
+        "step_wall_max": step_secs[-1] if step_secs else 0.0,
+        "storage_writes": sum(st.writes for st in stores.values()) - setup_writes,
+    }
+
@@ -0,0 +1,394 @@
+# modules/reminder_store.py
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import datetime
+
+from modules.fileio import read_log, write_json_atomic
+
+# Journal + snapshot storage for reminders.
+#
+# The snapshot (reminders.json) keeps the original list-of-dicts format. Every
+# mutation appends one fsync'd JSON line to the journal instead of rewriting the
+# snapshot, so add/remove/reschedule cost O(1) regardless of how many reminders
+# exist. On startup the snapshot is loaded and the journal replayed on top.
+# Once the journal is longer than the live set (and at least COMPACT_MIN lines),
+# the live set is written as a new snapshot and the journal truncated, which keeps
+# compaction amortized O(1) per mutation.
+#
+# Journal ops only ever *set* state (add/overwrite by id, remove by id, set
+# remind_at, clear), so replaying a journal over a snapshot that already
+# contains its effects is harmless. That makes a crash between "snapshot
+# written" and "journal truncated" safe.
+
+COMPACT_MIN = 1000
+
+
+def new_id():
+    return uuid.uuid4().hex[:12]
+
+
+def due_epoch(remind_at):
+    """'YYYY-MM-DD HH:MM:SS' (local time) -> epoch seconds, or None for untimed/bad values."""
+    if not remind_at:
+        return None
+    try:
+        return datetime.strptime(remind_at, "%Y-%m-%d %H:%M:%S").timestamp()
+    except Exception:
+        return None
+
+
+def normalize(item):
+    """Coerce one stored row into {id, task, remind_at, repeat}; None if unusable."""
+    if isinstance(item, str):
+        return {"id": new_id(), "task": item, "remind_at": None, "repeat": None}
+    if isinstance(item, dict):
+        return {
+            "id": item.get("id") or new_id(),
+            "task": item.get("task", ""),
+            "remind_at": item.get("remind_at"),
+            "repeat": item.get("repeat", None)
+        }
+    return None
+
+
+class JournalStore:
+    """In-memory reminder set backed by a JSON snapshot plus an append-only journal."""
+
+    def __init__(self, snapshot_path, journal_path, fsync=True):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path
+        self.fsync = fsync      # False only for simulations/benchmarks
+        self.writes = 0         # journal appends + snapshot writes
+        self._lock = threading.RLock()
+        self._items = {}        # id -> reminder dict, insertion ordered
+        self._journal_lines = 0
+        self._load()
+
+    # ---------- startup ----------
+
+    def _load(self):
+        raw = []
+        needs_snapshot = not os.path.exists(self.snapshot_path)
+        if not needs_snapshot:
+            try:
+                with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                    raw = json.load(f)
+                if not isinstance(raw, list):
+                    raw, needs_snapshot = [], True
+            except Exception:
+                raw, needs_snapshot = [], True
+
+        for item in raw:
+            rem = normalize(item)
+            if rem is None:
+                continue
+            if not isinstance(item, dict) or not item.get("id"):
+                needs_snapshot = True  # persist freshly assigned ids
+            self._items[rem["id"]] = rem
+
+        bad_lines = 0
+        for line in read_log(self.journal_path, fsync=self.fsync).splitlines():
+            try:
+                self._apply(json.loads(line))
+            except Exception:
+                bad_lines += 1
+                continue
+            self._journal_lines += 1
+
+        if needs_snapshot or self._journal_lines or bad_lines:
+            self.compact()
+
+    def _apply(self, rec):
+        op = rec.get("op")
+        if op == "add":
+            rem = normalize(rec.get("reminder"))
+            if rem is not None:
+                self._items[rem["id"]] = rem
+        elif op == "remove":
+            self._items.pop(rec.get("id"), None)
+        elif op == "reschedule":
+            rem = self._items.get(rec.get("id"))
+            if rem is not None:
+                rem["remind_at"] = rec.get("remind_at")
+        elif op == "clear":
+            self._items.clear()
+
+    # ---------- journal ----------
+
+    def _append(self, rec):
+        # Opened per record rather than held open: a process hosting thousands
+        # of users would otherwise keep one descriptor per user. The fsync
+        # dominates the cost either way.
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        self.writes += 1
+        self._journal_lines += 1
+        if self._journal_lines >= max(COMPACT_MIN, len(self._items)):
+            self.compact()
+
+    def compact(self):
+        """Fold the journal into a fresh snapshot and truncate it."""
+        with self._lock:
+            write_json_atomic(self.snapshot_path, list(self._items.values()))
+            with open(self.journal_path, "w", encoding="utf-8") as f:
+                f.flush()
+                os.fsync(f.fileno())
+            self.writes += 1
+            self._journal_lines = 0
+
+    # ---------- public API ----------
+
+    def all(self):
+        with self._lock:
+            return [dict(r) for r in self._items.values()]
+
+    def get(self, rem_id):
+        with self._lock:
+            rem = self._items.get(rem_id)
+            return dict(rem) if rem is not None else None
+
+    def due_before(self, until):
+        """Timed reminders due at or before epoch `until`, earliest first."""
+        with self._lock:
+            hits = []
+            for r in self._items.values():
+                due = due_epoch(r.get("remind_at"))
+                if due is not None and due <= until:
+                    hits.append((due, dict(r)))
+        hits.sort(key=lambda h: h[0])
+        return [r for _, r in hits]
+
+    def add(self, rem):
+        """Store a reminder (assigning an id if needed); returns the stored copy."""
+        rem = normalize(rem)
+        with self._lock:
+            self._items[rem["id"]] = rem
+            self._append({"op": "add", "reminder": rem})
+            return dict(rem)
+
+    def remove(self, rem_id):
+        with self._lock:
+            if self._items.pop(rem_id, None) is None:
+                return False
+            self._append({"op": "remove", "id": rem_id})
+            return True
+
+    def reschedule(self, rem_id, remind_at):
+        with self._lock:
+            rem = self._items.get(rem_id)
+            if rem is None:
+                return False
+            rem["remind_at"] = remind_at
+            self._append({"op": "reschedule", "id": rem_id, "remind_at": remind_at})
+            return True
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._append({"op": "clear"})
+
+    def replace_all(self, reminders):
+        """Swap the whole set (legacy save_reminders path); writes a snapshot."""
+        with self._lock:
+            self._items = {}
+            for item in reminders:
+                rem = normalize(item)
+                if rem is not None:
+                    self._items[rem["id"]] = rem
+            self.compact()
+
+
+# ---------------------------------------------------------------------------
+# SQLite backend
+#
+# Same API as JournalStore, but rows live in a WAL-mode SQLite table with an
+# index on the due epoch, so due lookups are range queries and each mutation
+# touches one row. Every row is tagged with a user_id, and all stores for the
+# same database file share one connection, so a process hosting many users
+# keeps a single file open. Ids are unique per user, not across users, so two
+# users' reminders with the same id never replace each other. On first start
+# a user's existing JSON snapshot (+ journal) is imported once; a meta row
+# records that so a later clear does not re-import.
+# ---------------------------------------------------------------------------
+
+_REMINDERS_TABLE = """
+CREATE TABLE IF NOT EXISTS {name} (
+    seq       INTEGER PRIMARY KEY AUTOINCREMENT,
+    id        TEXT NOT NULL,
+    user_id   TEXT NOT NULL DEFAULT 'default',
+    task      TEXT NOT NULL,
+    remind_at TEXT,
+    due       REAL,
+    repeat    TEXT,
+    UNIQUE (user_id, id)
+);
+"""
+
+_SCHEMA = _REMINDERS_TABLE.format(name="reminders") + """
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+_INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_reminders_due ON reminders(due);
+CREATE INDEX IF NOT EXISTS idx_reminders_user_due ON reminders(user_id, due);
+"""
+
+_COLS = "id, task, remind_at, repeat"
+
+_connections = {}   # abs db path -> (connection, lock)
+_connections_lock = threading.Lock()
+
+
+def _connect(db_path):
+    """One shared connection (and lock) per database file."""
+    key = os.path.abspath(db_path)
+    with _connections_lock:
+        if key not in _connections:
+            db = sqlite3.connect(db_path, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.executescript(_SCHEMA)
+            _upgrade_schema(db)
+            db.executescript(_INDEXES)
+            db.commit()
+            _connections[key] = (db, threading.RLock())
+        return _connections[key]
+
+
+def _unique_keys(db):
+    """Column lists of the UNIQUE constraints on the reminders table."""
+    keys = []
+    for idx in db.execute("PRAGMA index_list(reminders)").fetchall():
+        if idx[2]:  # unique
+            keys.append([c[2] for c in db.execute(f"PRAGMA index_info('{idx[1]}')")])
+    return keys
+
+
+def _upgrade_schema(db):
+    """Rebuild tables from before multi-user support (no user_id column) or
+       with a global UNIQUE(id), which let one user's row replace another's."""
+    cols = [r[1] for r in db.execute("PRAGMA table_info(reminders)")]
+    if "user_id" in cols and ["id"] not in _unique_keys(db):
+        return
+    user_expr = "user_id" if "user_id" in cols else "'default'"
+    db.execute("DROP TABLE IF EXISTS reminders_new")
+    db.executescript(_REMINDERS_TABLE.format(name="reminders_new"))
+    db.execute(
+        "INSERT OR REPLACE INTO reminders_new (seq, id, user_id, task, remind_at, due, repeat) "
+        f"SELECT seq, id, {user_expr}, task, remind_at, due, repeat FROM reminders ORDER BY seq")
+    db.execute("DROP TABLE reminders")
+    db.execute("ALTER TABLE reminders_new RENAME TO reminders")
+    db.commit()
+
+
+def _row_to_dict(row):
+    return {"id": row[0], "task": row[1], "remind_at": row[2], "repeat": row[3]}
+
+
+class SqliteStore:
+    """One user's reminders in SQLite (WAL mode, indexed by due epoch)."""
+
+    def __init__(self, db_path, user_id="default", migrate_from=None):
+        """migrate_from: optional (snapshot_path, journal_path) to import on first start."""
+        self.db_path = db_path
+        self.user_id = user_id
+        self.writes = 0         # committed mutations
+        self._db, self._lock = _connect(db_path)
+        if migrate_from:
+            self._migrate(*migrate_from)
+
+    def _migrate(self, snapshot_path, journal_path):
+        key = f"migrated_json:{self.user_id}"
+        with self._lock:
+            done = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+            if done:
+                return
+            if os.path.exists(snapshot_path) or os.path.exists(journal_path):
+                legacy = JournalStore(snapshot_path, journal_path).all()
+                self._insert_many(legacy)
+            self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, '1')", (key,))
+            self._db.commit()
+
+    def _insert_many(self, reminders):
+        rows = []
+        for item in reminders:
+            rem = normalize(item)
+            if rem is not None:
+                rows.append((rem["id"], self.user_id, rem["task"], rem["remind_at"],
+                             due_epoch(rem["remind_at"]), rem["repeat"]))
+        self._db.executemany(
+            "INSERT OR REPLACE INTO reminders (id, user_id, task, remind_at, due, repeat) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            rows)
+
+    # ---------- public API ----------
+
+    def all(self):
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {_COLS} FROM reminders WHERE user_id = ? ORDER BY seq",
+                (self.user_id,)).fetchall()
+        return [_row_to_dict(r) for r in rows]
+
+    def get(self, rem_id):
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT {_COLS} FROM reminders WHERE id = ? AND user_id = ?",
+                (rem_id, self.user_id)).fetchone()
+        return _row_to_dict(row) if row else None
+
+    def due_before(self, until):
+        """Timed reminders due at or before epoch `until`, earliest first (index range scan)."""
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {_COLS} FROM reminders WHERE user_id = ? AND due IS NOT NULL AND due <= ? "
+                "ORDER BY due, seq",
+                (self.user_id, until)).fetchall()
+        return [_row_to_dict(r) for r in rows]
+
+    def add(self, rem):
+        rem = normalize(rem)
+        with self._lock:
+            self._insert_many([rem])
+            self._db.commit()
+            self.writes += 1
+        return dict(rem)
+
+    def remove(self, rem_id):
+        with self._lock:
+            cur = self._db.execute(
+                "DELETE FROM reminders WHERE id = ? AND user_id = ?", (rem_id, self.user_id))
+            self._db.commit()
+            self.writes += 1
+        return cur.rowcount > 0
+
+    def reschedule(self, rem_id, remind_at):
+        with self._lock:
+            cur = self._db.execute(
+                "UPDATE reminders SET remind_at = ?, due = ? WHERE id = ? AND user_id = ?",
+                (remind_at, due_epoch(remind_at), rem_id, self.user_id))
+            self._db.commit()
+            self.writes += 1
+        return cur.rowcount > 0
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM reminders WHERE user_id = ?", (self.user_id,))
+            self._db.commit()
+            self.writes += 1
+
+    def replace_all(self, reminders):
+        with self._lock:
+            self._db.execute("DELETE FROM reminders WHERE user_id = ?", (self.user_id,))
+            self._insert_many(reminders)
+            self._db.commit()
+            self.writes += 1
@@ -0,0 +1,289 @@
+# modules/reminder_table.py
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+import numpy as np
+
+# Compact, column-oriented reminder table.
+#
+# A reminder dict with three strings costs several hundred bytes; here a row is
+# 8 (due) + 8 (id) + 4 (task) + 1 (repeat) + 1 (weekday) + 1 (alive) bytes, with
+# task text interned so repeated tasks ("take medicine") are stored once.
+#
+# Due times are stored as *local wall-clock* seconds since 1970-01-01 (the same
+# naive local time as the 'remind_at' strings), not as UTC epochs. Adding
+# 86400 or 7*86400 therefore keeps the clock time fixed across DST changes,
+# exactly like the datetime arithmetic in modules/reminders.py, and bulk
+# rescheduling stays a couple of vectorized integer operations.
+#
+# Scope: this is a snapshot for bulk queries (ReminderEngine.table() builds one
+# from a user's stored reminders). The running scheduler does not use it; it
+# still keeps one dict per reminder in the store plus one per heap entry, so the
+# per-row figures above describe the table, not the engine's memory.
+# benchmarks/bench_reminder_table.py compares its due scan and reschedule with
+# the store's.
+
+REPEAT_NONE = 0
+REPEAT_DAILY = 1
+REPEAT_WEEKLY = 2
+
+_PERIOD_SECS = np.array([0, 86400, 7 * 86400], dtype=np.int64)
+_WEEKDAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+_EPOCH = datetime(1970, 1, 1)
+_FMT = "%Y-%m-%d %H:%M:%S"
+
+NO_DUE = np.iinfo(np.int64).max   # untimed reminders never match a due scan
+
+
+def local_seconds(dt: datetime) -> int:
+    """Naive local datetime -> whole wall-clock seconds since 1970-01-01."""
+    return int((dt - _EPOCH).total_seconds())
+
+
+def from_local_seconds(secs) -> datetime:
+    return _EPOCH + timedelta(seconds=int(secs))
+
+
+_EPOCH_ORDINAL = _EPOCH.toordinal()
+
+
+@lru_cache(maxsize=4096)
+def _day_seconds(date_part):
+    """'YYYY-MM-DD' -> local seconds at midnight (cached: many rows share a day)."""
+    return (date.fromisoformat(date_part).toordinal() - _EPOCH_ORDINAL) * 86400
+
+
+def _parse_due(remind_at):
+    """'YYYY-MM-DD HH:MM:SS' -> local seconds without going through strptime."""
+    if not remind_at:
+        return NO_DUE
+    try:
+        hh, mm, ss = remind_at[11:13], remind_at[14:16], remind_at[17:19]
+        if len(remind_at) != 19 or remind_at[10] != " ":
+            raise ValueError(remind_at)
+        return _day_seconds(remind_at[:10]) + int(hh) * 3600 + int(mm) * 60 + int(ss)
+    except Exception:
+        return NO_DUE
+
+
+def _parse_repeat(repeat):
+    """'daily' / 'weekly:Monday' / None -> (repeat code, weekday or -1)."""
+    if repeat == "daily":
+        return REPEAT_DAILY, -1
+    if repeat and repeat.startswith("weekly:"):
+        name = repeat.split(":", 1)[1].strip().capitalize()
+        wd = _WEEKDAY_NAMES.index(name) if name in _WEEKDAY_NAMES else -1
+        return REPEAT_WEEKLY, wd
+    return REPEAT_NONE, -1
+
+
+class ReminderTable:
+    """Array-backed reminder rows with vectorized due scans and bulk rescheduling.
+
+    Rows are addressed by integer index. Removing a row tombstones it (it stops
+    matching any query); compact() reclaims the space and renumbers rows.
+
+    A lower bound on the earliest due time is kept so the common "nothing is
+    due yet" answer is O(1) instead of a full column scan."""
+
+    __slots__ = ("_n", "_min_due", "_due", "_id", "_task", "_repeat", "_weekday", "_alive",
+                 "_tasks", "_task_index", "_odd_ids", "_odd_index")
+
+    def __init__(self, capacity=1024):
+        capacity = max(16, int(capacity))
+        self._n = 0
+        self._min_due = NO_DUE    # lower bound on min(_due)
+        self._due = np.full(capacity, NO_DUE, dtype=np.int64)
+        self._id = np.zeros(capacity, dtype=np.int64)
+        self._task = np.zeros(capacity, dtype=np.int32)
+        self._repeat = np.zeros(capacity, dtype=np.int8)
+        self._weekday = np.full(capacity, -1, dtype=np.int8)
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._tasks = []          # interned task text
+        self._task_index = {}     # task text -> index in _tasks
+        self._odd_ids = []        # ids that are not 12-char hex (legacy/imported)
+        self._odd_index = {}
+
+    @classmethod
+    def from_reminders(cls, reminders):
+        reminders = list(reminders)
+        table = cls(capacity=len(reminders))
+        table.extend(reminders)
+        return table
+
+    # ---------- interning ----------
+
+    def _intern_task(self, task):
+        idx = self._task_index.get(task)
+        if idx is None:
+            idx = len(self._tasks)
+            self._tasks.append(task)
+            self._task_index[task] = idx
+        return idx
+
+    def _encode_id(self, rem_id):
+        """12-char lowercase hex ids (reminder_store.new_id) pack into an int64;
+           others are interned as negatives. Only ids that decode back to the
+           same string are packed (not "0x12345678ab", "ABCDEF012345", ...)."""
+        rem_id = rem_id or ""
+        if len(rem_id) == 12:
+            try:
+                code = int(rem_id, 16)
+            except ValueError:
+                code = None
+            if code is not None and format(code, "012x") == rem_id:
+                return code
+        code = self._odd_index.get(rem_id)
+        if code is None:
+            self._odd_ids.append(rem_id)
+            code = -len(self._odd_ids)
+            self._odd_index[rem_id] = code
+        return code
+
+    def _decode_id(self, code):
+        code = int(code)
+        if code < 0:
+            return self._odd_ids[-code - 1]
+        return format(code, "012x")
+
+    # ---------- growth ----------
+
+    def _reserve(self, extra):
+        need = self._n + extra
+        cap = len(self._due)
+        if need <= cap:
+            return
+        new_cap = max(need, cap * 2)
+        pad = new_cap - cap
+        self._due = np.concatenate([self._due, np.full(pad, NO_DUE, dtype=np.int64)])
+        self._id = np.concatenate([self._id, np.zeros(pad, dtype=np.int64)])
+        self._task = np.concatenate([self._task, np.zeros(pad, dtype=np.int32)])
+        self._repeat = np.concatenate([self._repeat, np.zeros(pad, dtype=np.int8)])
+        self._weekday = np.concatenate([self._weekday, np.full(pad, -1, dtype=np.int8)])
+        self._alive = np.concatenate([self._alive, np.zeros(pad, dtype=bool)])
+
+    # ---------- mutation ----------
+
+    def append(self, rem):
+        """Add one reminder dict (id, task, remind_at, repeat); returns its row."""
+        self._reserve(1)
+        i = self._n
+        self._due[i] = _parse_due(rem.get("remind_at"))
+        self._id[i] = self._encode_id(rem.get("id"))
+        self._task[i] = self._intern_task(rem.get("task", ""))
+        self._repeat[i], self._weekday[i] = _parse_repeat(rem.get("repeat"))
+        self._alive[i] = True
+        self._min_due = min(self._min_due, int(self._due[i]))
+        self._n += 1
+        return i
+
+    def extend(self, reminders):
+        """Bulk append: parse into Python lists, then fill each column slice at once."""
+        reminders = list(reminders)
+        k = len(reminders)
+        self._reserve(k)
+        due, ids, tasks, repeats, weekdays = [], [], [], [], []
+        for rem in reminders:
+            due.append(_parse_due(rem.get("remind_at")))
+            ids.append(self._encode_id(rem.get("id")))
+            tasks.append(self._intern_task(rem.get("task", "")))
+            code, wd = _parse_repeat(rem.get("repeat"))
+            repeats.append(code)
+            weekdays.append(wd)
+        lo, hi = self._n, self._n + k
+        self._due[lo:hi] = due
+        self._id[lo:hi] = ids
+        self._task[lo:hi] = tasks
+        self._repeat[lo:hi] = repeats
+        self._weekday[lo:hi] = weekdays
+        self._alive[lo:hi] = True
+        if k:
+            self._min_due = min(self._min_due, min(due))
+        self._n = hi
+
+    def remove(self, rows):
+        rows = np.asarray(rows, dtype=np.int64)
+        self._alive[rows] = False
+        self._due[rows] = NO_DUE
+
+    def reschedule(self, rows, now_secs):
+        """Bulk-advance fired rows past `now_secs` (local seconds).
+
+        Repeating rows jump straight to their first occurrence after now;
+        one-off rows are removed. Returns how many occurrences of each row
+        were due (>= 1), aligned with `rows`."""
+        rows = np.asarray(rows, dtype=np.int64)
+        due = self._due[rows]
+        period = _PERIOD_SECS[self._repeat[rows]]
+        repeating = period > 0
+        times = np.ones(len(rows), dtype=np.int64)
+        late = repeating & (due <= now_secs)
+        times[late] = (now_secs - due[late]) // period[late] + 1
+        self._due[rows[repeating]] = due[repeating] + period[repeating] * times[repeating]
+        self.remove(rows[~repeating])
+        self._refresh_min()
+        return times
+
+    def compact(self):
+        """Drop tombstoned rows; row numbers change."""
+        keep = np.flatnonzero(self._alive[:self._n])
+        for name in ("_due", "_id", "_task", "_repeat", "_weekday", "_alive"):
+            col = getattr(self, name)
+            setattr(self, name, col[keep].copy())
+        self._n = len(keep)
+        self._refresh_min()
+
+    def _refresh_min(self):
+        self._min_due = int(self._due[:self._n].min()) if self._n else NO_DUE
+
+    # ---------- queries ----------
+
+    def __len__(self):
+        return int(np.count_nonzero(self._alive[:self._n]))
+
+    def due_rows(self, until_secs):
+        """Rows due at or before `until_secs` (local seconds), in row order."""
+        if until_secs < self._min_due:
+            return np.empty(0, dtype=np.int64)
+        return np.flatnonzero(self._due[:self._n] <= until_secs)
+
+    def due_between(self, start_secs, end_secs):
+        """Rows whose next due time is in [start_secs, end_secs), in row order."""
+        due = self._due[:self._n]
+        return np.flatnonzero((due >= start_secs) & (due < end_secs))
+
+    def next_due(self):
+        """Earliest due time (local seconds), or None if nothing is timed."""
+        self._refresh_min()
+        return None if self._min_due == NO_DUE else self._min_due
+
+    def row(self, i):
+        """Row i as a reminder dict (the format used by modules/reminders)."""
+        due = self._due[i]
+        code = self._repeat[i]
+        if code == REPEAT_DAILY:
+            repeat = "daily"
+        elif code == REPEAT_WEEKLY:
+            wd = int(self._weekday[i])
+            name = _WEEKDAY_NAMES[wd] if wd >= 0 else from_local_seconds(due).strftime("%A")
+            repeat = f"weekly:{name}"
+        else:
+            repeat = None
+        return {
+            "id": self._decode_id(self._id[i]),
+            "task": self._tasks[self._task[i]],
+            "remind_at": None if due == NO_DUE else from_local_seconds(due).strftime(_FMT),
+            "repeat": repeat,
+        }
+
+    def rows(self, rows):
+        return [self.row(i) for i in rows]
+
+    def to_reminders(self):
+        return self.rows(np.flatnonzero(self._alive[:self._n]))
+
+    def nbytes(self):
+        """Approximate memory held by the table (column arrays plus interned strings)."""
+        cols = sum(getattr(self, n).nbytes for n in ("_due", "_id", "_task", "_repeat", "_weekday", "_alive"))
+        strings = sum(len(t) for t in self._tasks) + sum(len(i) for i in self._odd_ids)
+        return cols + strings
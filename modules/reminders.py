@@ -1,17 +1,70 @@
 # modules/reminders.py
-import json
 import os
-import time
 import threading
+import time
 import re
+import heapq
+import itertools
+from collections import deque, namedtuple
 from datetime import datetime, timedelta
+from functools import lru_cache
+
+from modules.reminder_store import JournalStore, SqliteStore, due_epoch
 
 REMINDER_PATH = os.path.join("data", "reminders.json")
+JOURNAL_PATH = os.path.join("data", "reminders.journal")
+REMINDER_DB_PATH = os.path.join("data", "reminders.db")
+
+# Multi-user hosting: every user other than DEFAULT_USER gets a partition
+# under USERS_DIR/<user_id>/ (journal backend) or rows tagged with their id
+# in REMINDER_DB_PATH (sqlite backend). DEFAULT_USER keeps the paths above.
+DEFAULT_USER = "default"
+USERS_DIR = os.path.join("data", "users")
+
+# "journal" (JSON snapshot + append-only journal) or "sqlite"
+REMINDER_BACKEND = os.getenv("REMINDER_BACKEND", "journal").strip().lower()
 
 # ---------------- Time helpers ----------------
+# All reminder code reads time through _clock, so a SimulatedClock can be
+# swapped in (set_clock) to drive months of schedules without real sleeps.
+
+class SystemClock:
+    """Wall clock; waiting really blocks on the condition."""
+
+    def now(self):
+        return datetime.now()
+
+    def wait(self, cond, timeout):
+        cond.wait(timeout=timeout)
+
+
+class SimulatedClock:
+    """Virtual clock: waiting jumps time forward instead of sleeping."""
+
+    def __init__(self, start=None):
+        self._t = start if start is not None else datetime.now().replace(microsecond=0)
+
+    def now(self):
+        return self._t
+
+    def advance(self, seconds):
+        self._t += timedelta(seconds=seconds)
+
+    def wait(self, cond, timeout):
+        if timeout is not None and timeout > 0:
+            self.advance(timeout)
+
+
+_clock = SystemClock()
+
+def set_clock(clock):
+    """Swap the time source (e.g. SimulatedClock); returns the previous one."""
+    global _clock
+    previous, _clock = _clock, clock
+    return previous
 
 def _now():
-    return datetime.now()
+    return _clock.now()
 
 def _now_str():
     return _now().strftime("%Y-%m-%d %H:%M:%S")
@@ -20,115 +73,318 @@ def _fmt(dt: datetime) -> str:
     return dt.strftime("%Y-%m-%d %H:%M:%S")
 
 # ---------------- Storage ----------------
+# Default: reminders live in memory, backed by a snapshot (REMINDER_PATH) plus
+# an append-only journal. With REMINDER_BACKEND=sqlite they live in
+# REMINDER_DB_PATH instead (the JSON data is imported on first start).
+# See modules/reminder_store.py.
+
+_USER_ID_RE = re.compile(r"^[A-Za-z0-9_.-]{1,64}$")
+
+def _check_user_id(user_id):
+    if not isinstance(user_id, str) or not _USER_ID_RE.match(user_id) or user_id in (".", ".."):
+        raise ValueError(f"Invalid user id: {user_id!r}")
+    return user_id
+
+def _open_store(user_id):
+    """Open the storage partition for one user."""
+    if user_id == DEFAULT_USER:
+        snapshot, journal = REMINDER_PATH, JOURNAL_PATH
+    else:
+        base = os.path.join(USERS_DIR, user_id)
+        snapshot = os.path.join(base, "reminders.json")
+        journal = os.path.join(base, "reminders.journal")
+    if REMINDER_BACKEND == "sqlite":
+        return SqliteStore(REMINDER_DB_PATH, user_id=user_id, migrate_from=(snapshot, journal))
+    if user_id != DEFAULT_USER:
+        os.makedirs(base, exist_ok=True)
+    return JournalStore(snapshot, journal)
+
+# ---------------- Scheduler (one heap shared by all users) ----------------
+# The engine keeps timed reminders of every registered user in a single
+# min-heap and one checker thread sleeps until the earliest one is due.
+# Mutations push onto the heap and notify the condition so the checker
+# re-evaluates its sleep. A user's storage is only read when the user is
+# registered. Each user has a generation number; clearing or re-registering
+# bumps it, and stale heap entries are discarded when popped, so one user's
+# changes never require touching other users' entries.
+
+_MAX_SLEEP = 60.0  # re-check the wall clock at least this often (clock changes, DST)
+
+# Users registered with a prefetch(task) hook get it called PREFETCH_LEAD_SECS
+# before each reminder is due (e.g. to render the spoken prompt in advance).
+# These run from a second heap keyed by due - lead, served by the same thread.
+PREFETCH_LEAD_SECS = 300.0
+
+
+class ReminderEngine:
+    """Schedules and dispatches reminders for many users from one thread.
+
+    store_factory(user_id) opens a user's storage and dispatch(fn, args) runs a
+    callback; both default to the production versions. With autostart=False no
+    checker thread is started and the caller drives the engine with step()."""
+
+    def __init__(self, store_factory=None, dispatch=None, autostart=True):
+        self._store_factory = store_factory or _open_store
+        self._dispatch = dispatch       # None -> module dispatcher (_dispatch)
+        self._autostart = autostart
+        self._cond = threading.Condition()
+        self._heap = []                 # (due_epoch, seq, user_id, generation, reminder dict)
+        self._seq = itertools.count()   # tie-breaker so dicts are never compared
+        self._stores = {}               # user_id -> store
+        self._handlers = {}             # user_id -> (callback, on_missed, catchup)
+        self._gens = {}                 # user_id -> generation
+        self._prefetchers = {}          # user_id -> prefetch(task)
+        self._prefetch_heap = []        # (due_epoch - lead, seq, user_id, generation, reminder dict)
+        self._thread = None
+
+    # ---------- storage ----------
+
+    def store(self, user_id=DEFAULT_USER):
+        with self._cond:
+            st = self._stores.get(user_id)
+            if st is None:
+                st = self._store_factory(_check_user_id(user_id))
+                self._stores[user_id] = st
+            return st
+
+    def reminders(self, user_id=DEFAULT_USER):
+        return self.store(user_id).all()
+
+    def due(self, user_id=DEFAULT_USER, until=None):
+        when = until if until is not None else _now()
+        return self.store(user_id).due_before(when.timestamp())
+
+    def table(self, user_id=DEFAULT_USER):
+        """Compact columnar copy of a user's reminders for bulk queries
+           (see modules/reminder_table.py; needs numpy). A snapshot: the
+           scheduler itself keeps its own per-reminder dicts."""
+        from modules.reminder_table import ReminderTable
+        return ReminderTable.from_reminders(self.reminders(user_id))
+
+    def add(self, rem, user_id=DEFAULT_USER):
+        """Persist a new reminder and, if the user is registered, schedule it."""
+        with self._cond:
+            stored = self.store(user_id).add(rem)
+            self._schedule(user_id, stored)
+            return stored
+
+    def replace(self, reminders, user_id=DEFAULT_USER):
+        with self._cond:
+            self.store(user_id).replace_all(reminders)
+            self._reschedule_user(user_id)
+
+    def clear(self, user_id=DEFAULT_USER):
+        with self._cond:
+            self.store(user_id).clear()
+            self._gens[user_id] = self._gens.get(user_id, 0) + 1
+            self._cond.notify()
+
+    # ---------- registration ----------
+
+    def register(self, user_id, callback, on_missed=None, catchup="coalesce", prefetch=None):
+        """Deliver user_id's reminders to callback(task) (see reminder_checker)."""
+        with self._cond:
+            self._handlers[_check_user_id(user_id)] = (callback, on_missed, catchup)
+            if prefetch is not None:
+                self._prefetchers[user_id] = prefetch
+            else:
+                self._prefetchers.pop(user_id, None)
+            self._reschedule_user(user_id)
+        if self._autostart:
+            self.start()
+
+    def unregister(self, user_id):
+        with self._cond:
+            self._handlers.pop(user_id, None)
+            self._prefetchers.pop(user_id, None)
+            self._gens[user_id] = self._gens.get(user_id, 0) + 1
+
+    def registered_users(self):
+        with self._cond:
+            return list(self._handlers)
+
+    def start(self):
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, daemon=True, name="reminder-checker")
+            self._thread.start()
+
+    # ---------- heap ----------
+
+    def _schedule(self, user_id, rem):
+        """Push a timed reminder onto the heap and wake the checker. Caller holds _cond."""
+        if user_id not in self._handlers:
+            return  # picked up from storage when the user registers
+        due = due_epoch(rem.get("remind_at"))
+        if due is None:
+            return
+        gen = self._gens.get(user_id, 0)
+        heapq.heappush(self._heap, (due, next(self._seq), user_id, gen, rem))
+        if user_id in self._prefetchers:
+            heapq.heappush(self._prefetch_heap, (due - PREFETCH_LEAD_SECS, next(self._seq), user_id, gen, rem))
+        self._cond.notify()
+
+    def _reschedule_user(self, user_id):
+        """Invalidate a user's heap entries and push their stored reminders again."""
+        self._gens[user_id] = self._gens.get(user_id, 0) + 1
+        for r in self.store(user_id).all():
+            self._schedule(user_id, r)
+        self._cond.notify()
+
+    def _wait_for_due(self, until=None):
+        """Block until at least one reminder is due (or `until` passes);
+           pop and return (user_id, rem) pairs. Prefetch hooks that come due
+           meanwhile are called outside the lock."""
+        while True:
+            with self._cond:
+                now = _now()
+                ts = now.timestamp()
+                if self._heap and self._heap[0][0] <= ts:
+                    due = []
+                    while self._heap and self._heap[0][0] <= ts:
+                        _, _, user_id, gen, rem = heapq.heappop(self._heap)
+                        if gen == self._gens.get(user_id, 0) and user_id in self._handlers:
+                            due.append((user_id, rem))
+                    return due
+                prefetch = self._pop_prefetch(ts)
+                if not prefetch:
+                    if until is not None and now >= until:
+                        return []
+                    timeout = _MAX_SLEEP
+                    if self._heap:
+                        timeout = min(timeout, self._heap[0][0] - ts)
+                    if self._prefetch_heap:
+                        timeout = min(timeout, self._prefetch_heap[0][0] - ts)
+                    if until is not None:
+                        timeout = min(timeout, (until - now).total_seconds())
+                    _clock.wait(self._cond, timeout)
+                    continue
+            for fn, task in prefetch:
+                try:
+                    fn(task)
+                except Exception:
+                    pass  # a prefetch is only an optimization
+
+    def _pop_prefetch(self, ts):
+        """(hook, task) for prefetches that are due at ts. Caller holds _cond."""
+        out = []
+        while self._prefetch_heap and self._prefetch_heap[0][0] <= ts:
+            _, _, user_id, gen, rem = heapq.heappop(self._prefetch_heap)
+            fn = self._prefetchers.get(user_id)
+            if fn is not None and gen == self._gens.get(user_id, 0):
+                out.append((fn, rem["task"]))
+        return out
+
+    def _persist_fired(self, fired):
+        """Apply (user_id, reminder, advanced-or-None): drop one-offs, re-schedule repeats."""
+        with self._cond:
+            for user_id, r, moved in fired:
+                store = self.store(user_id)
+                if store.get(r["id"]) is None:
+                    continue  # cleared while we were firing
+                if moved:
+                    store.reschedule(moved["id"], moved["remind_at"])
+                    self._schedule(user_id, moved)
+                else:
+                    store.remove(r["id"])
+
+    def step(self, until=None):
+        """Wait for the next due reminders (or until `until`), dispatch and persist them.
+           Returns (user_id, reminder, times) for each reminder that fired."""
+        due = self._wait_for_due(until)
+        now = _now()
+        fired, out = [], []
+        for user_id, r in due:
+            moved, times = _advance_reminder(dict(r), now)
+            with self._cond:
+                handler = self._handlers.get(user_id)
+            if handler is not None:
+                target = _pick_target(*handler, r["task"], times)
+                if target is not None:
+                    (self._dispatch or _dispatch)(*target)
+            fired.append((user_id, r, moved))
+            out.append((user_id, r, times))
+        self._persist_fired(fired)
+        return out
+
+    def _run(self):
+        while True:
+            self.step()
 
-def load_reminders():
-    """Load reminders from JSON file; normalize to list of dicts with keys:
-       task, remind_at (or None), repeat (None or 'daily' or 'weekly:Monday')."""
-    if not os.path.exists(REMINDER_PATH):
-        save_reminders([])
-        return []
-    try:
-        with open(REMINDER_PATH, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        if not isinstance(data, list):
-            data = []
-        fixed = []
-        for item in data:
-            if isinstance(item, str):
-                fixed.append({"task": item, "remind_at": None, "repeat": None})
-            elif isinstance(item, dict):
-                fixed.append({
-                    "task": item.get("task", ""),
-                    "remind_at": item.get("remind_at"),
-                    "repeat": item.get("repeat", None)
-                })
-        return fixed
-    except Exception:
-        save_reminders([])
-        return []
 
-def save_reminders(reminders):
-    """Save list of reminders (list of dicts)."""
-    with open(REMINDER_PATH, "w", encoding="utf-8") as f:
-        json.dump(reminders, f, ensure_ascii=False, indent=2)
+_engine = ReminderEngine()
+
+def load_reminders(user_id=DEFAULT_USER):
+    """Return reminders as a list of dicts with keys:
+       id, task, remind_at (or None), repeat (None or 'daily' or 'weekly:Monday')."""
+    return _engine.reminders(user_id)
+
+def load_due_reminders(until=None, user_id=DEFAULT_USER):
+    """Timed reminders due at or before `until` (datetime, default now), earliest first."""
+    return _engine.due(user_id, until)
+
+def save_reminders(reminders, user_id=DEFAULT_USER):
+    """Replace the whole reminder list."""
+    _engine.replace(reminders, user_id)
 
 # ---------------- Day 8: simple text reminder ----------------
 
-def add_text_reminder(text):
-    reminders = load_reminders()
-    reminders.append({"task": text, "remind_at": None, "repeat": None})
-    save_reminders(reminders)
+def add_text_reminder(text, user_id=DEFAULT_USER):
+    _engine.add({"task": text, "remind_at": None, "repeat": None}, user_id)
 
 # ---------------- Day 9: timed (seconds) reminder ----------------
 
-def add_timed_reminder(task, seconds_from_now):
-    reminders = load_reminders()
+def add_timed_reminder(task, seconds_from_now, user_id=DEFAULT_USER):
     remind_at_dt = _now() + timedelta(seconds=seconds_from_now)
-    reminders.append({"task": task, "remind_at": _fmt(remind_at_dt), "repeat": None})
-    save_reminders(reminders)
+    _engine.add({"task": task, "remind_at": _fmt(remind_at_dt), "repeat": None}, user_id)
     return _fmt(remind_at_dt)
 
 # ---------------- Day 10: clock-time parsing ----------------
+# One compiled grammar covers every clock format we accept; the (hour, minute)
+# result is cached per distinct phrase since voice commands repeat a lot.
+
+_CLOCK_RE = re.compile(
+    r"^(?:at\s+)?(?:(?P<word>noon|midnight)"
+    r"|(?P<h>\d{1,2})(?::(?P<m>\d{2}))?(?:\s*(?P<mer>[ap])\.?\s*m\.?)?)$"
+)
+
+@lru_cache(maxsize=1024)
+def _clock_hm(s: str):
+    """Normalized clock phrase -> (hour, minute); raises ValueError if unreadable."""
+    m = _CLOCK_RE.match(s)
+    if not m:
+        raise ValueError("Unrecognized time format")
+    if m.group("word"):
+        return (12, 0) if m.group("word") == "noon" else (0, 0)
+    hh = int(m.group("h")); mm = int(m.group("m") or 0); mer = m.group("mer")
+    if mer:
+        if not 1 <= hh <= 12:
+            raise ValueError("Hour must be 1-12 with am/pm")
+        if mer == "p" and hh != 12: hh += 12
+        if mer == "a" and hh == 12: hh = 0
+    if hh > 23 or mm > 59:
+        raise ValueError("Time out of range")
+    return hh, mm
 
 def parse_time_to_today(time_str: str) -> datetime:
     """
     Accepts things like:
-      - '8:30 pm', '8 pm', '08:30 pm'
-      - '07:10', '7:10', '19:45' (24h)
-      - '7 am', '7:00 am'
+      - '8:30 pm', '8 pm', '08:30 pm', '8:30pm', '8 p.m.'
+      - '07:10', '7:10', '19:45' (24h), '19'
+      - '7 am', '7:00 am', 'noon', 'midnight'
     Returns a datetime set to today (or tomorrow if time already passed today).
     """
-    s = time_str.strip().lower()
+    hh, mm = _clock_hm(" ".join(time_str.strip().lower().split()))
     now = _now()
+    dt = now.replace(hour=hh, minute=mm, second=0, microsecond=0)
+    if dt <= now: dt += timedelta(days=1)
+    return dt
 
-    # optional leading 'at '
-    if s.startswith("at "):
-        s = s[3:].strip()
-
-    # hh:mm am/pm
-    m = re.match(r"^(\d{1,2}):(\d{2})\s*(am|pm)$", s)
-    if m:
-        hh = int(m.group(1)); mm = int(m.group(2)); mer = m.group(3)
-        if mer == "pm" and hh != 12: hh += 12
-        if mer == "am" and hh == 12: hh = 0
-        dt = now.replace(hour=hh, minute=mm, second=0, microsecond=0)
-        if dt <= now: dt += timedelta(days=1)
-        return dt
-
-    # hh am/pm
-    m = re.match(r"^(\d{1,2})\s*(am|pm)$", s)
-    if m:
-        hh = int(m.group(1)); mer = m.group(2); mm = 0
-        if mer == "pm" and hh != 12: hh += 12
-        if mer == "am" and hh == 12: hh = 0
-        dt = now.replace(hour=hh, minute=mm, second=0, microsecond=0)
-        if dt <= now: dt += timedelta(days=1)
-        return dt
-
-    # 24-hour with minutes: HH:MM
-    m = re.match(r"^(\d{1,2}):(\d{2})$", s)
-    if m:
-        hh = int(m.group(1)); mm = int(m.group(2))
-        dt = now.replace(hour=hh, minute=mm, second=0, microsecond=0)
-        if dt <= now: dt += timedelta(days=1)
-        return dt
-
-    # Just hour (24h)
-    m = re.match(r"^(\d{1,2})$", s)
-    if m:
-        hh = int(m.group(1)); mm = 0
-        dt = now.replace(hour=hh, minute=mm, second=0, microsecond=0)
-        if dt <= now: dt += timedelta(days=1)
-        return dt
-
-    raise ValueError("Unrecognized time format")
-
-def add_clock_reminder(task: str, time_str: str):
+def add_clock_reminder(task: str, time_str: str, user_id=DEFAULT_USER):
     """One-off reminder for a specific clock time like '8:30 pm' or '07:10'."""
     dt = parse_time_to_today(time_str)
-    reminders = load_reminders()
-    reminders.append({"task": task, "remind_at": _fmt(dt), "repeat": None})
-    save_reminders(reminders)
+    _engine.add({"task": task, "remind_at": _fmt(dt), "repeat": None}, user_id)
     return _fmt(dt)
 
 # ---------------- Day 11: recurring rules (daily / weekly) ----------------
@@ -149,84 +405,324 @@ def _next_weekday_at_time(target_weekday: int, time_str: str) -> datetime:
         dt += timedelta(days=7)
     return dt
 
-def add_daily_reminder(task: str, time_str: str):
+def add_daily_reminder(task: str, time_str: str, user_id=DEFAULT_USER):
     """Repeat every day at given time."""
     first_dt = parse_time_to_today(time_str)
-    reminders = load_reminders()
-    reminders.append({"task": task, "remind_at": _fmt(first_dt), "repeat": "daily"})
-    save_reminders(reminders)
+    _engine.add({"task": task, "remind_at": _fmt(first_dt), "repeat": "daily"}, user_id)
     return _fmt(first_dt)
 
-def add_weekly_reminder(task: str, weekday_name: str, time_str: str):
+def add_weekly_reminder(task: str, weekday_name: str, time_str: str, user_id=DEFAULT_USER):
     """Repeat every <weekday> at given time. weekday_name e.g. 'monday'."""
     wd = weekday_name.strip().lower()
     if wd not in _WEEKDAYS:
         raise ValueError("Unknown weekday")
     first_dt = _next_weekday_at_time(_WEEKDAYS[wd], time_str)
-    reminders = load_reminders()
-    reminders.append({"task": task, "remind_at": _fmt(first_dt), "repeat": f"weekly:{wd.capitalize()}"})
-    save_reminders(reminders)
+    _engine.add({"task": task, "remind_at": _fmt(first_dt), "repeat": f"weekly:{wd.capitalize()}"}, user_id)
     return _fmt(first_dt)
 
-def _advance_reminder(rem):
-    """Given a fired reminder with repeat, move it forward and return updated dict; else return None to drop."""
-    repeat = rem.get("repeat")
-    if not repeat:
+def add_weekday_reminder(task: str, weekday_name: str, time_str: str, user_id=DEFAULT_USER):
+    """One-off reminder on the next <weekday> at given time."""
+    wd = weekday_name.strip().lower()
+    if wd not in _WEEKDAYS:
+        raise ValueError("Unknown weekday")
+    dt = _next_weekday_at_time(_WEEKDAYS[wd], time_str)
+    _engine.add({"task": task, "remind_at": _fmt(dt), "repeat": None}, user_id)
+    return _fmt(dt)
+
+# ---------------- Reminder command grammar ----------------
+# "remind me ..." phrases are parsed in a single regex pass into a
+# ReminderCommand. Parsing is pure (no clock reads), so results are cached
+# per phrase; times are resolved against now only when the reminder is added.
+# Durations may be compound ("in 2 hours and 30 minutes", "in 1 hour 15 mins").
+# A task that is just "to" ("remind me at 8 pm to") is rejected.
+
+ReminderCommand = namedtuple("ReminderCommand", "kind task seconds time weekday")
+# kind: 'text' | 'in' | 'at' | 'on' (one-off on a weekday) | 'daily' | 'weekly'
+
+_WEEKDAY_ALIASES = {
+    "mon": "monday", "tue": "tuesday", "tues": "tuesday", "wed": "wednesday",
+    "thu": "thursday", "thur": "thursday", "thurs": "thursday", "fri": "friday",
+    "sat": "saturday", "sun": "sunday",
+}
+_UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+_TIME_TOKEN = r"(?:noon|midnight|\d{1,2}(?::\d{2})?(?:\s*[ap]\.?\s*m\.?)?)"
+_DAY_TOKEN = "(?:" + "|".join(
+    sorted(list(_WEEKDAYS) + list(_WEEKDAY_ALIASES), key=len, reverse=True)) + ")"
+_UNIT_TOKEN = r"(?:seconds?|secs?|minutes?|mins?|hours?|hrs?|hr|days?)\b"
+_AMOUNT_TOKEN = r"(?:\d+|an?|one)"
+_DURATION_PART_RE = re.compile(rf"(?P<amount>{_AMOUNT_TOKEN})\s*(?P<unit>{_UNIT_TOKEN})", re.IGNORECASE)
+
+_REMIND_RE = re.compile(rf"""
+    ^\s*remind\s+me
+    (?:
+        \s+(?:
+            (?:every\s+day|each\s+day|daily)\s+at\s+(?P<daily>{_TIME_TOKEN})
+          | (?:every|each)\s+(?P<wday>{_DAY_TOKEN})s?\s+at\s+(?P<wtime>{_TIME_TOKEN})
+          | in\s+(?P<duration>{_AMOUNT_TOKEN}\s*{_UNIT_TOKEN}
+                (?:\s*,?\s*(?:and\s+)?{_AMOUNT_TOKEN}\s*{_UNIT_TOKEN})*)
+          | (?:on|next)\s+(?P<oday>{_DAY_TOKEN})\s+at\s+(?P<otime>{_TIME_TOKEN})
+          | at\s+(?P<at>{_TIME_TOKEN})
+        )
+        (?:\s+to)?
+      | \s+to
+    )
+    \s+(?P<task>.+?)\s*$
+""", re.IGNORECASE | re.VERBOSE)
+
+def _canon_weekday(word):
+    w = word.lower()
+    return _WEEKDAY_ALIASES.get(w, w)
+
+@lru_cache(maxsize=2048)
+def _parse_reminder_cached(text: str):
+    m = _REMIND_RE.match(text)
+    if not m:
         return None
+    g = m.groupdict()
+    task = g["task"]
+    if task.lower() == "to":
+        return None  # "remind me at 8 pm to": no task
+    if g["daily"]:
+        return ReminderCommand("daily", task, None, g["daily"], None)
+    if g["wday"]:
+        return ReminderCommand("weekly", task, None, g["wtime"], _canon_weekday(g["wday"]))
+    if g["duration"]:
+        seconds = 0
+        for part in _DURATION_PART_RE.finditer(g["duration"]):
+            amount = part["amount"].lower()
+            n = 1 if amount in ("a", "an", "one") else int(amount)
+            seconds += n * _UNIT_SECONDS[part["unit"][0].lower()]
+        return ReminderCommand("in", task, seconds, None, None)
+    if g["oday"]:
+        return ReminderCommand("on", task, None, g["otime"], _canon_weekday(g["oday"]))
+    if g["at"]:
+        return ReminderCommand("at", task, None, g["at"], None)
+    return ReminderCommand("text", task, None, None, None)
+
+def parse_reminder_command(text: str):
+    """Parse a 'remind me ...' phrase into a ReminderCommand, or None.
+       Handles relative ('in 2 hours'), clock ('at 8:30 pm'), weekday
+       ('on friday at 9 am'), and recurring ('every day at 7 am',
+       'every monday at 7 pm') forms."""
+    return _parse_reminder_cached(" ".join((text or "").split()))
+
+def reminder_usage_hint(low: str) -> str:
+    """Example phrasing for a 'remind me ...' command we couldn't parse."""
+    if low.startswith("remind me every day"):
+        return "Try: remind me every day at 8 am to take medicine"
+    if low.startswith("remind me every"):
+        return "Try: remind me every monday at 7 pm to call Mom"
+    if low.startswith("remind me at"):
+        return "Try: remind me at 8:30 pm to take medicine"
+    if low.startswith("remind me in"):
+        return "Try: remind me in 10 minutes to drink water (seconds, minutes, hours or days)"
+    if low.startswith("remind me on"):
+        return "Try: remind me on friday at 9 am to call the doctor"
+    return "Remind you to… what? Try: remind me to call Mom"
+
+def _repeat_period(repeat):
+    """Length of one recurrence period, or None for one-off reminders."""
+    if repeat == "daily":
+        return timedelta(days=1)
+    if repeat and repeat.startswith("weekly:"):
+        return timedelta(days=7)
+    return None
+
+def _advance_reminder(rem, now=None):
+    """Given a fired reminder, move it to its first occurrence after `now`.
+       Returns (updated dict or None to drop, number of occurrences that were due).
+       Missed periods are skipped arithmetically, so catching up after downtime is O(1)."""
+    period = _repeat_period(rem.get("repeat"))
+    if period is None:
+        return None, 1
     try:
         current = datetime.strptime(rem["remind_at"], "%Y-%m-%d %H:%M:%S")
     except Exception:
-        return None
+        return None, 1
 
-    if repeat == "daily":
-        next_dt = current + timedelta(days=1)
-        rem["remind_at"] = _fmt(next_dt)
-        return rem
+    if now is None:
+        now = _now()
+    times = 1
+    if current <= now:
+        times = (now - current) // period + 1
+    rem["remind_at"] = _fmt(current + period * times)
+    return rem, times
 
-    if repeat.startswith("weekly:"):
-        # Just add 7 days forward
-        next_dt = current + timedelta(days=7)
-        rem["remind_at"] = _fmt(next_dt)
-        return rem
+# ---------------- Upcoming occurrences (window queries) ----------------
 
-    return None
-
-def clear_reminders():
-    save_reminders([])
+def _occurrences(rem, start, end):
+    """Lazily yield (datetime, rem) for each occurrence of rem in [start, end).
+       The first occurrence at or after start is computed directly, not stepped to."""
+    try:
+        at = datetime.strptime(rem["remind_at"], "%Y-%m-%d %H:%M:%S")
+    except Exception:
+        return
+    period = _repeat_period(rem.get("repeat"))
+    if period is None:
+        if start <= at < end:
+            yield at, rem
+        return
+    if at < start:
+        at += period * -((at - start) // period)  # ceil((start - at) / period) periods
+    while at < end:
+        yield at, rem
+        at += period
+
+def iter_occurrences(start=None, end=None, user_id=DEFAULT_USER):
+    """Yield (datetime, reminder) for every occurrence in [start, end), earliest first.
+       Daily/weekly rules are expanded on demand, so consumers that stop early
+       (e.g. one page) never materialize the rest of the window."""
+    start = start if start is not None else _now()
+    end = end if end is not None else start + timedelta(days=7)
+    streams = [_occurrences(r, start, end) for r in load_reminders(user_id) if r.get("remind_at")]
+    return heapq.merge(*streams, key=lambda occ: occ[0])
+
+def upcoming_occurrences(days=7, page=1, page_size=10, start=None, user_id=DEFAULT_USER):
+    """One page of occurrences due in the next `days` days.
+       Returns (items, has_more); items are dicts with id, task, at, repeat."""
+    start = start if start is not None else _now()
+    page = max(1, int(page))
+    skip = (page - 1) * page_size
+    it = iter_occurrences(start, start + timedelta(days=days), user_id=user_id)
+    chunk = list(itertools.islice(it, skip, skip + page_size + 1))
+    items = [{"id": r["id"], "task": r["task"], "at": _fmt(at), "repeat": r.get("repeat")}
+             for at, r in chunk[:page_size]]
+    return items, len(chunk) > page_size
+
+def clear_reminders(user_id=DEFAULT_USER):
+    _engine.clear(user_id)
 
 # ---------------- Background checker ----------------
 
-def reminder_checker(callback):
-    """Run a background thread that fires callback(task) when reminders are due.
-       Non-repeating reminders are removed. Repeating reminders are re-scheduled."""
-    def run():
-        while True:
-            reminders = load_reminders()
-            now_str = _now_str()
-            remaining = []
-            changed = False
-
-            for r in reminders:
-                due_time = r.get("remind_at")
-                if due_time and due_time <= now_str:
-                    # Fire
-                    try:
-                        callback(r["task"])
-                    except Exception:
-                        pass  # never crash the checker
-
-                    # Reschedule if repeating
-                    moved = _advance_reminder(r)
-                    if moved:
-                        remaining.append(moved)
-                        changed = True
-                else:
-                    remaining.append(r)
-
-            if changed or len(remaining) != len(reminders):
-                save_reminders(remaining)
-
-            time.sleep(1)
+def _pick_target(callback, on_missed, catchup, task, times):
+    """Choose which user callback (if any) handles one due reminder."""
+    if times <= 1:
+        return callback, (task,)
+    if catchup == "skip":
+        return None
+    if on_missed is not None:
+        return on_missed, (task, times)
+    return callback, (task,)
+
+# ---------------- Callback dispatch ----------------
+# Callbacks (beep/speak/notify) can be slow or hang, so the checker never runs
+# them itself: each one gets its own daemon thread, started straight away, and
+# the checker goes back to the heap. A watchdog marks a callback that runs past
+# CALLBACK_TIMEOUT as timed out (counted, and no longer "running"); nothing
+# waits on it, so a hung SMTP/Twilio call never delays the next reminder.
+#
+# Threads can't be killed, so abandoned callbacks stay alive until they return.
+# At most DISPATCH_MAX_LIVE callback threads exist at once, hung ones included;
+# beyond that firings wait in a queue of DISPATCH_MAX_PENDING (and are dropped
+# when it is full) until a thread finishes.
+
+DISPATCH_MAX_LIVE = 32
+DISPATCH_MAX_PENDING = 256
+CALLBACK_TIMEOUT = 30.0
+
+_dispatch_lock = threading.Lock()
+_dispatch_pending = deque()     # (fn, args) waiting for a thread
+_dispatch_live = {}             # token -> [start, timed_out]
+_watchdog_started = False
+_dispatch_counters = {
+    "queued": 0,        # waiting for a thread (DISPATCH_MAX_LIVE reached)
+    "running": 0,       # within their time budget
+    "hung": 0,          # timed out and still alive
+    "completed": 0,
+    "failed": 0,        # callback raised
+    "timed_out": 0,
+    "dropped": 0,       # rejected because the dispatch queue was full
+    "total_secs": 0.0,  # summed callback duration (timeouts count as CALLBACK_TIMEOUT)
+    "max_secs": 0.0,
+}
 
-    t = threading.Thread(target=run, daemon=True)
-    t.start()
+def dispatch_stats():
+    """Snapshot of the reminder callback dispatch counters."""
+    with _dispatch_lock:
+        out = dict(_dispatch_counters)
+    done = out["completed"] + out["failed"] + out["timed_out"]
+    out["queue_depth"] = out["queued"]
+    out["avg_secs"] = (out["total_secs"] / done) if done else 0.0
+    return out
+
+def _finish_callback(took, failed=False, timed_out=False):
+    """Caller holds _dispatch_lock."""
+    c = _dispatch_counters
+    c["running"] -= 1
+    if timed_out:
+        c["timed_out"] += 1
+        c["hung"] += 1
+    elif failed:
+        c["failed"] += 1
+    else:
+        c["completed"] += 1
+    c["total_secs"] += took
+    c["max_secs"] = max(c["max_secs"], took)
+
+def _run_callback(token, fn, args):
+    start = time.monotonic()
+    failed = False
+    try:
+        fn(*args)
+    except Exception:
+        failed = True
+    with _dispatch_lock:
+        _, timed_out = _dispatch_live.pop(token)
+        if timed_out:
+            _dispatch_counters["hung"] -= 1   # already counted by the watchdog
+        else:
+            _finish_callback(time.monotonic() - start, failed=failed)
+        _start_pending()
+
+def _start_pending():
+    """Start queued callbacks while under DISPATCH_MAX_LIVE. Caller holds _dispatch_lock."""
+    while _dispatch_pending and len(_dispatch_live) < DISPATCH_MAX_LIVE:
+        fn, args = _dispatch_pending.popleft()
+        token = object()
+        _dispatch_live[token] = [time.monotonic(), False]
+        _dispatch_counters["queued"] -= 1
+        _dispatch_counters["running"] += 1
+        threading.Thread(target=_run_callback, args=(token, fn, args),
+                         daemon=True, name="reminder-cb").start()
+
+def _watchdog():
+    while True:
+        time.sleep(min(1.0, CALLBACK_TIMEOUT / 4))
+        now = time.monotonic()
+        with _dispatch_lock:
+            for entry in _dispatch_live.values():
+                if not entry[1] and now - entry[0] >= CALLBACK_TIMEOUT:
+                    entry[1] = True
+                    _finish_callback(CALLBACK_TIMEOUT, timed_out=True)
+
+def _dispatch(fn, args):
+    """Run a callback on its own thread; never blocks the checker."""
+    global _watchdog_started
+    with _dispatch_lock:
+        if len(_dispatch_pending) >= DISPATCH_MAX_PENDING:
+            _dispatch_counters["dropped"] += 1
+            return False
+        _dispatch_pending.append((fn, args))
+        _dispatch_counters["queued"] += 1
+        _start_pending()
+        if not _watchdog_started:
+            threading.Thread(target=_watchdog, daemon=True, name="reminder-cb-watchdog").start()
+            _watchdog_started = True
+    return True
+
+def reminder_checker(callback, on_missed=None, catchup="coalesce", user_id=DEFAULT_USER, prefetch=None):
+    """Start the background checker (once) and fire callback(task) when user_id's
+       reminders are due. Callbacks run on their own threads (see dispatch_stats()).
+       Non-repeating reminders are removed. Repeating reminders are re-scheduled
+       to their next future occurrence. Call again with another user_id to serve
+       more users from the same thread; each user gets their own callbacks.
+
+       If a repeating reminder was due several times (e.g. the app was off),
+       catchup='coalesce' fires once: on_missed(task, times) if given, else
+       callback(task). catchup='skip' drops the missed occurrences silently.
+
+       prefetch(task), if given, is called PREFETCH_LEAD_SECS before each
+       reminder is due (or right away if it is due sooner), from the checker
+       thread, so it must not block."""
+    _engine.register(user_id, callback, on_missed=on_missed, catchup=catchup, prefetch=prefetch)
@@ -0,0 +1,203 @@
+# modules/speech_queue.py
+import threading
+import time
+from collections import OrderedDict, deque
+
+# Pending speech, by priority.
+#
+#   PRIORITY_EMERGENCY > PRIORITY_REMINDER > PRIORITY_REPLY
+#
+# get() always takes from the highest non-empty lane, FIFO within a lane.
+# The pieces of one speak() call share an Utterance. The reply lane is bounded
+# by utterances, not pieces: when more than reply_max_pending replies are
+# waiting, every remaining piece of the oldest one is dropped (their done
+# events are set so nobody waits on them forever), so a long reply never loses
+# its own beginning. cancel(utterance) drops the rest of a reply the same way
+# (voice.py does that when urgent speech cuts it off). Urgent lanes are never
+# dropped. A text that is already pending (same text and rate) is not
+# queued twice: the waiter joins the pending item, which moves up a lane if
+# the new request is more urgent. on_urgent() is called whenever something
+# above reply priority is queued, so the player can cut a reply short, and
+# on_drop(item) for each reply dropped from a full lane.
+#
+# Items carry the timestamps filled in by voice.py as they move through the
+# pipeline (monotonic seconds; see tts_metrics.py).
+
+PRIORITY_REPLY = 0
+PRIORITY_REMINDER = 1
+PRIORITY_EMERGENCY = 2
+
+REPLY_MAX_PENDING = 8
+
+
+class Utterance:
+    """The pieces of one speak() call."""
+    __slots__ = ("cancelled",)
+
+    def __init__(self):
+        self.cancelled = False
+
+
+class SpeechItem:
+    __slots__ = ("text", "rate", "done_evts", "priority", "utterance",
+                 "wall_enqueue", "t_enqueue", "t_dequeue", "t_synth_start", "t_synth_end",
+                 "t_play_start", "t_play_end", "backend", "cache_hit", "error")
+
+    def __init__(self, text, rate, done_evts, priority, utterance=None):
+        self.text = text
+        self.rate = rate
+        self.done_evts = tuple(done_evts)
+        self.priority = priority
+        self.utterance = utterance if utterance is not None else Utterance()
+        self.wall_enqueue = time.time()
+        self.t_enqueue = time.monotonic()
+        self.t_dequeue = None
+        self.t_synth_start = None
+        self.t_synth_end = None
+        self.t_play_start = None
+        self.t_play_end = None
+        self.backend = None
+        self.cache_hit = None
+        self.error = None
+
+    def finish(self):
+        for evt in self.done_evts:
+            try:
+                evt.set()
+            except Exception:
+                pass
+
+
+class SpeechQueue:
+    """Priority lanes with drop-oldest for replies and de-duplication."""
+
+    def __init__(self, reply_max_pending=REPLY_MAX_PENDING, on_urgent=None, on_drop=None):
+        self.reply_max_pending = reply_max_pending
+        self.on_urgent = on_urgent
+        self.on_drop = on_drop
+        self.dropped = 0
+        self.deduplicated = 0
+        self._cond = threading.Condition()
+        self._lanes = {p: deque() for p in (PRIORITY_EMERGENCY, PRIORITY_REMINDER, PRIORITY_REPLY)}
+        self._pending = {}   # (text, rate) -> SpeechItem
+        self._replies = OrderedDict()   # Utterance -> pieces waiting in the reply lane
+        self._closed = False
+
+    # ---- reply lane bookkeeping (caller holds _cond) ----
+
+    def _removed(self, item):
+        """item left its lane (taken, promoted or dropped)."""
+        if item.priority != PRIORITY_REPLY:
+            return
+        n = self._replies.get(item.utterance, 0) - 1
+        if n > 0:
+            self._replies[item.utterance] = n
+        else:
+            self._replies.pop(item.utterance, None)
+
+    def _drop_utterance(self, utterance, reason):
+        """Remove every pending reply piece of utterance; returns them."""
+        lane = self._lanes[PRIORITY_REPLY]
+        gone = [it for it in lane if it.utterance is utterance]
+        if gone:
+            self._lanes[PRIORITY_REPLY] = deque(it for it in lane if it.utterance is not utterance)
+            for it in gone:
+                del self._pending[(it.text, it.rate)]
+                it.error = reason
+        self._replies.pop(utterance, None)
+        return gone
+
+    def _finish_dropped(self, items):
+        for it in items:
+            it.finish()
+            if self.on_drop is not None:
+                self.on_drop(it)
+
+    def put(self, text, rate=None, done_evts=(), priority=PRIORITY_REPLY, utterance=None):
+        dropped = []
+        with self._cond:
+            key = (text, rate)
+            item = self._pending.get(key)
+            if item is not None:
+                self.deduplicated += 1
+                item.done_evts += tuple(done_evts)
+                if priority > item.priority:
+                    self._lanes[item.priority].remove(item)
+                    self._removed(item)
+                    item.priority = priority
+                    self._lanes[priority].append(item)
+            else:
+                item = SpeechItem(text, rate, done_evts, priority, utterance)
+                self._pending[key] = item
+                self._lanes[priority].append(item)
+                if priority == PRIORITY_REPLY:
+                    self._replies[item.utterance] = self._replies.get(item.utterance, 0) + 1
+                    while len(self._replies) > self.reply_max_pending:
+                        oldest = next(iter(self._replies))
+                        dropped += self._drop_utterance(oldest, "dropped")
+                    self.dropped += len(dropped)
+            self._cond.notify()
+        self._finish_dropped(dropped)
+        if priority > PRIORITY_REPLY and self.on_urgent is not None:
+            self.on_urgent()
+
+    def cancel(self, utterance, reason="preempted"):
+        """Drop the pieces of utterance still waiting in the reply lane; later
+           pieces taken by get() can be checked with utterance.cancelled."""
+        with self._cond:
+            utterance.cancelled = True
+            dropped = self._drop_utterance(utterance, reason)
+        self._finish_dropped(dropped)
+        return len(dropped)
+
+    def _head(self):
+        for p in (PRIORITY_EMERGENCY, PRIORITY_REMINDER, PRIORITY_REPLY):
+            lane = self._lanes[p]
+            if lane:
+                return lane
+        return None
+
+    def get(self):
+        """Next item by priority; blocks while empty. None once closed."""
+        with self._cond:
+            while True:
+                lane = self._head()
+                if lane is not None:
+                    item = lane.popleft()
+                    del self._pending[(item.text, item.rate)]
+                    self._removed(item)
+                    item.t_dequeue = time.monotonic()
+                    return item
+                if self._closed:
+                    return None
+                self._cond.wait()
+
+    def take_if(self, pred):
+        """Remove and return the next item if pred(item) is true, else None (no wait)."""
+        with self._cond:
+            lane = self._head()
+            if lane is None or not pred(lane[0]):
+                return None
+            item = lane.popleft()
+            del self._pending[(item.text, item.rate)]
+            self._removed(item)
+            item.t_dequeue = time.monotonic()
+            return item
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def __len__(self):
+        with self._cond:
+            return sum(len(lane) for lane in self._lanes.values())
+
+    def stats(self):
+        with self._cond:
+            return {
+                "pending": {p: len(lane) for p, lane in self._lanes.items()},
+                "pending_replies": len(self._replies),
+                "dropped": self.dropped,
+                "deduplicated": self.deduplicated,
+            }
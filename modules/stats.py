@@ -0,0 +1,9 @@
+# modules/stats.py
+
+
+def percentile(sorted_vals, pct, default=None):
+    """Nearest-rank percentile of an ascending sequence; default if it is empty."""
+    if not sorted_vals:
+        return default
+    k = min(len(sorted_vals) - 1, max(0, int(round(pct / 100.0 * (len(sorted_vals) - 1)))))
+    return sorted_vals[k]
@@ -2,6 +2,8 @@
 import os
 import json
 import queue
+import threading
+import time
 import wave
 import numpy as np
 import sounddevice as sd
@@ -28,21 +30,126 @@ def has_offline_model(model_path=DEFAULT_MODEL_PATH):
     except Exception:
         return False
 
+# The model is loaded once per path and shared by every call (loading it
+# reads hundreds of MB and builds the decoding graph, which takes seconds).
+# preload_offline_model() does that on a background thread at startup;
+# a transcribe call that arrives before it is done waits for the same load.
+# Recognizers are kept per (path, samplerate) and Reset() between utterances.
+# Audio is fed to the recognizer while recording, so only the tail is left to
+# decode when the user stops speaking.
+# A model that fails to load is not retried until the next start; the error
+# is kept in _model_info so "offline model" can report it.
+
+_model_lock = threading.Lock()
+_models = {}        # model_path -> Model
+_model_info = {}    # model_path -> {"load_secs", "rss_bytes", "disk_bytes"} or {"error"}
+_idle_recognizers = {}   # (model_path, samplerate) -> [KaldiRecognizer]
+
+def _rss_bytes():
+    """Resident memory of this process, or None if it can't be read."""
+    try:
+        import psutil  # optional
+        return psutil.Process().memory_info().rss
+    except Exception:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        return None
+
+def _dir_bytes(path):
+    total = 0
+    for root, _dirs, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+def get_offline_model(model_path=DEFAULT_MODEL_PATH):
+    """The shared Vosk model for model_path (loaded on first use), or None."""
+    model = _models.get(model_path)
+    if model is not None:
+        return model
+    if not has_offline_model(model_path) or "error" in _model_info.get(model_path, ()):
+        return None
+    with _model_lock:
+        model = _models.get(model_path)
+        if model is None:
+            if "error" in _model_info.get(model_path, ()):
+                return None  # failed earlier; don't reload on every call
+            before = _rss_bytes()
+            t0 = time.perf_counter()
+            try:
+                model = Model(model_path)
+            except Exception as e:
+                _model_info[model_path] = {"error": repr(e)}
+                print(f"[stt] Offline model failed to load: {e}")
+                return None
+            after = _rss_bytes()
+            _model_info[model_path] = {
+                "load_secs": time.perf_counter() - t0,
+                "rss_bytes": (after - before) if (before is not None and after is not None) else None,
+                "disk_bytes": _dir_bytes(model_path),
+            }
+            _models[model_path] = model
+    return model
+
+def preload_offline_model(model_path=DEFAULT_MODEL_PATH, background=True):
+    """Load the model ahead of the first offline transcription.
+       Returns False if there is no usable model."""
+    if not has_offline_model(model_path):
+        return False
+    if background:
+        threading.Thread(target=get_offline_model, args=(model_path,),
+                         daemon=True, name="vosk-preload").start()
+        return True
+    return get_offline_model(model_path) is not None
+
+def offline_model_stats(model_path=DEFAULT_MODEL_PATH):
+    """Whether the model is loaded, how long loading took, the process
+       memory it added (rss_bytes, approximate) and its size on disk, or
+       the error if loading failed."""
+    info = dict(_model_info.get(model_path) or {})
+    info["loaded"] = model_path in _models
+    with _model_lock:
+        info["idle_recognizers"] = sum(len(v) for k, v in _idle_recognizers.items() if k[0] == model_path)
+    return info
+
+def _take_recognizer(model, model_path, samplerate):
+    with _model_lock:
+        idle = _idle_recognizers.get((model_path, samplerate))
+        if idle:
+            return idle.pop()
+    rec = KaldiRecognizer(model, samplerate)
+    rec.SetWords(False)
+    return rec
+
+def _return_recognizer(rec, model_path, samplerate):
+    try:
+        rec.Reset()
+    except Exception:
+        return  # don't reuse one in an unknown state
+    with _model_lock:
+        _idle_recognizers.setdefault((model_path, samplerate), []).append(rec)
+
 def transcribe_offline(seconds=5, model_path=DEFAULT_MODEL_PATH, samplerate=16000):
     """
     Record mic audio for <seconds> and recognize with Vosk (offline).
     Returns lowercased text or "" if unavailable.
     """
-    if not _vosk_ok or not has_offline_model(model_path):
+    if not _vosk_ok:
+        return ""
+    model = get_offline_model(model_path)
+    if model is None:
         return ""
 
-    model = Model(model_path)
-    rec = KaldiRecognizer(model, samplerate)
-    rec.SetWords(False)
-
+    rec = _take_recognizer(model, model_path, samplerate)
     q = queue.Queue()
 
-    def callback(indata, frames, time, status):
+    def callback(indata, frames, time_info, status):
         if status:
             # You can print(status) for debug if you want
             pass
@@ -51,16 +158,24 @@ def transcribe_offline(seconds=5, model_path=DEFAULT_MODEL_PATH, samplerate=1600
     try:
         with sd.RawInputStream(
             samplerate=samplerate,
-            blocksize=8000,
+            blocksize=4000,
             dtype="int16",
             channels=1,
             callback=callback,
             device=_input_device_index
         ):
-            sd.sleep(int(seconds * 1000))
-            while not q.empty():
-                data = q.get()
-                rec.AcceptWaveform(data)
+            # decode while recording instead of after
+            end = time.monotonic() + seconds
+            while True:
+                left = end - time.monotonic()
+                if left <= 0:
+                    break
+                try:
+                    rec.AcceptWaveform(q.get(timeout=left))
+                except queue.Empty:
+                    break
+        while not q.empty():
+            rec.AcceptWaveform(q.get())
         try:
             res = json.loads(rec.FinalResult())
             return (res.get("text") or "").strip().lower()
@@ -68,6 +183,8 @@ def transcribe_offline(seconds=5, model_path=DEFAULT_MODEL_PATH, samplerate=1600
             return ""
     except Exception:
         return ""
+    finally:
+        _return_recognizer(rec, model_path, samplerate)
 
 # -----------------------------
 # Mic device helpers (Day 14)
@@ -0,0 +1,246 @@
+# modules/tts_backends.py
+import asyncio
+import os
+import random
+import threading
+import time
+
+from modules import tts_stream
+
+# Speech backends used by voice.py.
+#
+#   EdgeBackend   Edge TTS over the network (mp3, can stream); the default
+#   LocalBackend  offline system voices through pyttsx3 (SAPI5/NSSpeech/espeak)
+#   FakeBackend   no network, no audio device: sleeps for a configurable
+#                 synthesis and playback time, for tests and benchmarks
+#
+# voice.py tries the configured backends in order for each utterance. A
+# backend that fails is skipped for FAILURE_COOLDOWN_SECS, so when the network
+# is down only the first utterance pays the Edge timeout and the rest go
+# straight to the local engine.
+
+try:
+    import edge_tts  # pip install edge-tts
+except Exception:
+    edge_tts = None
+
+try:
+    from playsound import playsound  # pip install playsound==1.2.2
+except Exception:
+    playsound = None
+
+try:
+    import pyttsx3  # pip install pyttsx3 (optional, offline voices)
+except Exception:
+    pyttsx3 = None
+
+FAILURE_COOLDOWN_SECS = 30.0
+EDGE_TIMEOUT_SECS = 10.0    # whole synthesis, or until the first streamed chunk
+EDGE_CHUNK_TIMEOUT_SECS = 5.0   # between streamed chunks once audio has started
+
+
+def rate_to_pct(rate_int: int) -> str:
+    """
+    Edge TTS expects rate as a percentage string like '+10%' or '-20%'.
+    We'll map 170 -> '+0%'. Clamp around 100–250.
+    """
+    try:
+        r = int(rate_int)
+    except Exception:
+        r = 170
+    r = max(100, min(250, r))
+    pct = int(round((r - 170) / 170 * 100))  # rough mapping
+    sign = "+" if pct >= 0 else ""
+    return f"{sign}{pct}%"
+
+
+class TtsBackend:
+    """Synthesizes text to a file and plays such files."""
+
+    name = "base"
+    suffix = ".mp3"
+    cacheable = False     # output may go in the shared TtsCache
+    can_stream = False
+
+    def __init__(self):
+        self.failed_until = 0.0
+        self.failures = 0
+
+    def available(self):
+        return False
+
+    def usable(self, now=None):
+        return self.available() and (now if now is not None else time.monotonic()) >= self.failed_until
+
+    def mark_failed(self):
+        self.failures += 1
+        self.failed_until = time.monotonic() + FAILURE_COOLDOWN_SECS
+
+    def mark_ok(self):
+        self.failed_until = 0.0
+
+    def cache_voice(self, voice):
+        """The voice part of the cache key (backends must not share clips)."""
+        return f"{self.name}:{voice}"
+
+    def synthesize(self, text, voice, rate, out_path):
+        raise NotImplementedError
+
+    def play(self, path, should_stop=None):
+        """Blocking playback; False if cut short by should_stop()."""
+        if tts_stream.is_available():
+            return tts_stream.play_file(path, should_stop=should_stop)
+        playsound(path)
+        return True
+
+
+class EdgeBackend(TtsBackend):
+    name = "edge"
+    cacheable = True
+    can_stream = True
+
+    def __init__(self):
+        super().__init__()
+        self._local = threading.local()   # one asyncio loop per calling thread
+
+    def _loop(self):
+        loop = getattr(self._local, "loop", None)
+        if loop is None:
+            loop = self._local.loop = asyncio.new_event_loop()
+        return loop
+
+    def available(self):
+        return edge_tts is not None and (playsound is not None or tts_stream.is_available())
+
+    def cache_voice(self, voice):
+        return voice  # keeps clips cached before backends existed
+
+    def synthesize(self, text, voice, rate, out_path):
+        communicator = edge_tts.Communicate(text=text, voice=voice, rate=rate_to_pct(rate))
+        self._loop().run_until_complete(asyncio.wait_for(communicator.save(out_path), EDGE_TIMEOUT_SECS))
+
+    def stream(self, text, voice, rate, buf, on_first_chunk, max_keep_bytes):
+        """Feed audio chunks into buf as they arrive. on_first_chunk() runs
+           before the first one (so nothing is queued for playback if Edge
+           fails up front). Returns the whole mp3 for the cache, or None if it
+           was cut short or longer than max_keep_bytes."""
+        return self._loop().run_until_complete(
+            self._stream(text, voice, rate, buf, on_first_chunk, max_keep_bytes))
+
+    async def _stream(self, text, voice, rate, buf, on_first_chunk, max_keep_bytes):
+        communicator = edge_tts.Communicate(text=text, voice=voice, rate=rate_to_pct(rate))
+        chunks = communicator.stream().__aiter__()
+        parts, size, started = [], 0, False
+        try:
+            while True:
+                try:
+                    timeout = EDGE_CHUNK_TIMEOUT_SECS if started else EDGE_TIMEOUT_SECS
+                    chunk = await asyncio.wait_for(chunks.__anext__(), timeout)
+                except StopAsyncIteration:
+                    break
+                if chunk.get("type") != "audio":
+                    continue
+                data = chunk.get("data") or b""
+                if not started:
+                    started = True
+                    on_first_chunk()
+                if not buf.feed(data):
+                    return None  # player gave up
+                if parts is not None:
+                    size += len(data)
+                    parts.append(data)
+                    if size > max_keep_bytes:
+                        parts = None
+        finally:
+            if started:
+                buf.finish()
+        if not started:
+            raise RuntimeError("edge-tts returned no audio")
+        return b"".join(parts) if parts else None
+
+    def list_voices(self):
+        return self._loop().run_until_complete(edge_tts.list_voices())
+
+
+class LocalBackend(TtsBackend):
+    """Offline voices via pyttsx3; used when Edge TTS can't be reached."""
+
+    name = "local"
+    suffix = ".wav"
+
+    def __init__(self):
+        super().__init__()
+        self._engine = None
+
+    def available(self):
+        return pyttsx3 is not None and (playsound is not None or tts_stream.is_available())
+
+    def synthesize(self, text, voice, rate, out_path):
+        # pyttsx3 engines are not thread-safe; only the synthesis thread calls this
+        if self._engine is None:
+            self._engine = pyttsx3.init()
+        self._engine.setProperty("rate", int(rate))  # words per minute, same scale as ours
+        self._engine.save_to_file(text, out_path)
+        self._engine.runAndWait()
+        if not os.path.exists(out_path) or os.path.getsize(out_path) == 0:
+            raise RuntimeError("pyttsx3 produced no audio")
+
+
+class FakeBackend(TtsBackend):
+    """Simulated synthesis and playback (no network, no audio device).
+
+    synth_secs + synth_secs_per_char is the synthesis time; playback lasts
+    play_secs_per_char * len(text). fail_rate makes that share of syntheses
+    raise, to exercise failover."""
+
+    name = "fake"
+    suffix = ".fake"
+    cacheable = True
+
+    def __init__(self, synth_secs=0.15, synth_secs_per_char=0.0005, play_secs_per_char=0.06,
+                 fail_rate=0.0, seed=None):
+        super().__init__()
+        self.synth_secs = synth_secs
+        self.synth_secs_per_char = synth_secs_per_char
+        self.play_secs_per_char = play_secs_per_char
+        self.fail_rate = fail_rate
+        self.syntheses = 0
+        self.plays = 0
+        self._rng = random.Random(seed)
+
+    def available(self):
+        return True
+
+    def synthesize(self, text, voice, rate, out_path):
+        time.sleep(self.synth_secs + self.synth_secs_per_char * len(text))
+        if self.fail_rate and self._rng.random() < self.fail_rate:
+            raise RuntimeError("simulated synthesis failure")
+        self.syntheses += 1
+        with open(out_path, "w", encoding="utf-8") as f:
+            f.write(f"{self.play_secs_per_char * len(text)}\n{text}")
+
+    def play(self, path, should_stop=None):
+        with open(path, "r", encoding="utf-8") as f:
+            secs = float(f.readline())
+        self.plays += 1
+        end = time.monotonic() + secs
+        while True:
+            left = end - time.monotonic()
+            if left <= 0:
+                return True
+            if should_stop is not None and should_stop():
+                return False
+            time.sleep(min(left, 0.02))
+
+
+BACKENDS = {"edge": EdgeBackend, "local": LocalBackend, "fake": FakeBackend}
+
+
+def make_backends(names):
+    """Backends from a list like ['edge', 'local']; unknown names are skipped."""
+    out = []
+    for n in names:
+        cls = BACKENDS.get(n.strip().lower())
+        if cls is not None:
+            out.append(cls())
+    return out
@@ -0,0 +1,164 @@
+# modules/tts_cache.py
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+# Content-addressed cache of synthesized speech.
+#
+# A clip is stored as <sha256(voice, rate, text)>.mp3 in the cache directory,
+# so the same words in the same voice are synthesized once and replayed from
+# disk afterwards. Recency is kept in memory (an OrderedDict, oldest first)
+# and mirrored to the files' mtimes so it survives a restart. When the total
+# size goes over max_bytes the least recently played clips are deleted.
+
+
+def cache_key(text, voice, rate):
+    h = hashlib.sha256()
+    h.update(f"{voice}\0{rate}\0{text}".encode("utf-8"))
+    return h.hexdigest()
+
+
+class TtsCache:
+    """Byte-bounded LRU of mp3 clips keyed by (text, voice, rate)."""
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = int(max_bytes)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # key -> size in bytes, least recent first
+        self._bytes = 0
+        self._scan()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".mp3")
+
+    def _scan(self):
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return
+        found = []
+        for name in names:
+            path = os.path.join(self.directory, name)
+            if name.endswith(".tmp"):
+                try:
+                    os.remove(path)  # left over from an interrupted synthesis
+                except Exception:
+                    pass
+                continue
+            if not name.endswith(".mp3"):
+                continue
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            found.append((st.st_mtime, name[:-4], st.st_size))
+        for _mtime, key, size in sorted(found):
+            self._entries[key] = size
+            self._bytes += size
+        with self._lock:
+            self._evict()
+
+    def get(self, text, voice, rate):
+        """Path of the cached clip (marked most recently used), or None."""
+        key = cache_key(text, voice, rate)
+        path = self._path(key)
+        with self._lock:
+            size = self._entries.get(key)
+            if size is not None and not os.path.exists(path):
+                # deleted behind our back
+                del self._entries[key]
+                self._bytes -= size
+                size = None
+            if size is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return path
+
+    def contains(self, text, voice, rate):
+        """Whether the clip is cached (doesn't count as a hit/miss or touch recency)."""
+        with self._lock:
+            return cache_key(text, voice, rate) in self._entries
+
+    def put(self, text, voice, rate, synthesize):
+        """Call synthesize(tmp_path) to produce the clip, then add it to the
+           cache. Returns the cached path. A failed synthesis leaves nothing."""
+        key = cache_key(text, voice, rate)
+        path = self._path(key)
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        os.close(fd)
+        try:
+            synthesize(tmp)
+            size = os.path.getsize(tmp)
+            if size == 0:
+                raise ValueError("empty audio")
+            os.replace(tmp, path)
+        except Exception:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old
+            self._entries[key] = size
+            self._bytes += size
+            self._evict(keep=key)
+        return path
+
+    def put_bytes(self, text, voice, rate, data):
+        """Add an already synthesized clip (e.g. collected while streaming)."""
+        def write(tmp):
+            with open(tmp, "wb") as f:
+                f.write(data)
+        return self.put(text, voice, rate, write)
+
+    def _evict(self, keep=None):
+        while self._bytes > self.max_bytes and self._entries:
+            key, size = next(iter(self._entries.items()))
+            if key == keep:
+                break  # a single clip larger than the budget stays until replaced
+            del self._entries[key]
+            self._bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._entries):
+                try:
+                    os.remove(self._path(key))
+                except OSError:
+                    pass
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,150 @@
+# modules/tts_metrics.py
+import json
+import os
+import threading
+import time
+from collections import deque
+
+from modules.speech_queue import PRIORITY_REPLY
+from modules.stats import percentile
+
+# Per-utterance speech timings.
+#
+# Each SpeechItem (speech_queue.py) carries monotonic timestamps filled in as
+# it moves through the pipeline:
+#
+#   t_enqueue      speak() queued it
+#   t_dequeue      the synthesis stage took it
+#   t_synth_start  / t_synth_end   backend work (equal when served from cache)
+#   t_play_start   / t_play_end    playback
+#
+# plus the backend used, whether the audio came from the cache, and an error
+# for utterances that were not heard in full ("dropped", "preempted",
+# "synth_failed: <backend errors>", "play_failed: ..."). When the item is done
+# SpeechMetrics.record() derives the intervals, keeps the last WINDOW of them
+# for percentiles, counts errors, and optionally appends the record to a
+# JSON-lines trace (TTS_TRACE=1 -> logs/tts_trace.jsonl).
+#
+# SLO: a reply should start playing within SLO_SECS of being queued
+# (time_to_audio); stats() reports how many did not. Reminders and emergencies
+# jump the queue and are not counted against it.
+
+WINDOW = 1000
+SLO_SECS = float(os.getenv("TTS_SLO_SECS", "1.5"))
+TRACE_PATH = os.path.join("logs", "tts_trace.jsonl")
+
+_INTERVALS = ("queue_wait", "synth", "time_to_audio", "playback", "total")
+
+
+def _span(a, b):
+    if a is None or b is None:
+        return None
+    return round(max(0.0, b - a), 4)
+
+
+class SpeechMetrics:
+    """Rolling latency window, error counts and an optional trace file."""
+
+    def __init__(self, window=WINDOW, slo_secs=SLO_SECS, trace_path=None):
+        self.slo_secs = slo_secs
+        self._lock = threading.Lock()
+        self._recent = deque(maxlen=window)
+        self._completed = 0
+        self._errors = {}
+        self._backend_errors = {}
+        self._slo_total = 0
+        self._slo_missed = 0
+        self._trace_path = trace_path
+        self._trace = None
+
+    # ---------- trace ----------
+
+    def enable_trace(self, path=TRACE_PATH):
+        with self._lock:
+            self._trace_path = path
+
+    def disable_trace(self):
+        with self._lock:
+            self._trace_path = None
+            if self._trace is not None:
+                try:
+                    self._trace.close()
+                except Exception:
+                    pass
+                self._trace = None
+
+    def _write_trace(self, rec):
+        """Caller holds _lock."""
+        if self._trace_path is None:
+            return
+        try:
+            if self._trace is None:
+                d = os.path.dirname(self._trace_path)
+                if d:
+                    os.makedirs(d, exist_ok=True)
+                self._trace = open(self._trace_path, "a", encoding="utf-8", buffering=1)
+            self._trace.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        except Exception:
+            self._trace_path = None  # don't keep failing on every utterance
+
+    # ---------- recording ----------
+
+    def record(self, item):
+        """Account for a finished (played, failed, dropped or preempted) item."""
+        rec = {
+            "at": round(item.wall_enqueue, 3),
+            "priority": item.priority,
+            "chars": len(item.text),
+            "backend": item.backend,
+            "cache_hit": item.cache_hit,
+            "error": item.error,
+            "queue_wait": _span(item.t_enqueue, item.t_dequeue),
+            "synth": _span(item.t_synth_start, item.t_synth_end),
+            "time_to_audio": _span(item.t_enqueue, item.t_play_start),
+            "playback": _span(item.t_play_start, item.t_play_end),
+            "total": _span(item.t_enqueue, item.t_play_end if item.t_play_end is not None else time.monotonic()),
+        }
+        with self._lock:
+            self._completed += 1
+            if item.error:
+                reason = item.error.split(":", 1)[0]
+                self._errors[reason] = self._errors.get(reason, 0) + 1
+            else:
+                self._recent.append(rec)
+                if item.priority == PRIORITY_REPLY and rec["time_to_audio"] is not None:
+                    self._slo_total += 1
+                    if rec["time_to_audio"] > self.slo_secs:
+                        self._slo_missed += 1
+            self._write_trace(rec)
+
+    def record_backend_error(self, backend_name, exc):
+        """A backend attempt that failed (the utterance may still have been
+           spoken by the next backend)."""
+        key = f"{backend_name}:{type(exc).__name__}"
+        with self._lock:
+            self._backend_errors[key] = self._backend_errors.get(key, 0) + 1
+
+    def stats(self, priority=None):
+        """Percentiles (seconds) over the last WINDOW successful utterances
+           (of one priority, if given), error counts by reason, and SLO misses."""
+        with self._lock:
+            recent = [r for r in self._recent if priority is None or r["priority"] == priority]
+            out = {
+                "completed": self._completed,
+                "errors": dict(self._errors),
+                "backend_errors": dict(self._backend_errors),
+                "slo_secs": self.slo_secs,
+                "slo_checked": self._slo_total,
+                "slo_missed": self._slo_missed,
+                "slo_met_ratio": (1.0 - self._slo_missed / self._slo_total) if self._slo_total else 1.0,
+            }
+        for name in _INTERVALS:
+            vals = sorted(r[name] for r in recent if r[name] is not None)
+            out[name] = {
+                "n": len(vals),
+                "p50": percentile(vals, 50),
+                "p90": percentile(vals, 90),
+                "p99": percentile(vals, 99),
+                "max": vals[-1] if vals else None,
+            }
+        return out
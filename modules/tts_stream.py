@@ -0,0 +1,148 @@
+# modules/tts_stream.py
+import queue
+import threading
+
+# Streaming playback for Edge TTS.
+#
+# Instead of waiting for Communicate.save() to write the whole mp3, the
+# synthesizer feeds audio chunks into a StreamBuffer as they arrive and the
+# player decodes (miniaudio) and plays (sounddevice) them straight away, so the
+# first words are heard after the first chunk rather than the whole reply.
+# The buffer holds at most BUFFER_CHUNKS chunks; a fast synthesizer waits for
+# the player instead of growing memory. Nothing touches the disk.
+#
+# Playback checks should_stop() every FRAMES_PER_READ frames, which is what
+# lets urgent speech cut a reply short (voice.py). While the decoder is waiting
+# for the next chunk, read() polls every POLL_SECS and gives up (end of stream)
+# once should_stop() is true or the buffer was closed, so a stalled network
+# stream can't hold the player.
+
+try:
+    import miniaudio  # pip install miniaudio
+    import sounddevice as sd
+    _ok = True
+except Exception:
+    miniaudio = None
+    sd = None
+    _ok = False
+
+SAMPLE_RATE = 24000      # edge-tts streams 24 kHz mono mp3
+CHANNELS = 1
+FRAMES_PER_READ = 2400   # 100 ms of audio per decode step
+BUFFER_CHUNKS = 32       # edge-tts chunks are a few KB each
+POLL_SECS = 0.1
+
+_EOF = object()
+
+
+def is_available():
+    return _ok
+
+
+class StreamBuffer:
+    """Bounded byte pipe from the synthesizer thread to the player thread."""
+
+    def __init__(self, max_chunks=BUFFER_CHUNKS):
+        self._q = queue.Queue(maxsize=max_chunks)
+        self._pending = b""
+        self._eof = False
+        self._closed = threading.Event()
+        self.should_stop = None   # set by play_stream
+
+    # ---- producer side ----
+
+    def feed(self, data):
+        """Add a chunk; blocks while the buffer is full. False once the
+           player has given up (the producer should stop)."""
+        while not self._closed.is_set():
+            try:
+                self._q.put(bytes(data), timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def finish(self):
+        while not self._closed.is_set():
+            try:
+                self._q.put(_EOF, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    # ---- consumer side ----
+
+    def read(self, num_bytes):
+        """Up to num_bytes, blocking until some are available; b"" at the end
+           (or once closed or should_stop() is true)."""
+        while not self._pending and not self._eof:
+            if self._closed.is_set() or (self.should_stop is not None and self.should_stop()):
+                self._eof = True
+                break
+            try:
+                chunk = self._q.get(timeout=POLL_SECS)
+            except queue.Empty:
+                continue
+            if chunk is _EOF:
+                self._eof = True
+            else:
+                self._pending = chunk
+        out, self._pending = self._pending[:num_bytes], self._pending[num_bytes:]
+        return out
+
+    def close(self):
+        """Player side is done (finished or failed); unblocks the producer."""
+        self._closed.set()
+
+
+if _ok:
+    class _Source(miniaudio.StreamableSource):
+        def __init__(self, buf):
+            self._buf = buf
+
+        def read(self, num_bytes):
+            return self._buf.read(num_bytes)
+
+
+def _play_frames(frames, should_stop=None):
+    """Write decoded frames to the output device. False if stopped early."""
+    with sd.RawOutputStream(samplerate=SAMPLE_RATE, channels=CHANNELS, dtype="int16") as out:
+        while True:
+            if should_stop is not None and should_stop():
+                return False
+            try:
+                samples = frames.send(FRAMES_PER_READ)
+            except StopIteration:
+                return not (should_stop is not None and should_stop())
+            if samples:
+                out.write(samples.tobytes())
+
+
+def play_stream(buf, should_stop=None):
+    """Decode and play a StreamBuffer until the synthesizer finishes it (or
+       should_stop() turns true). Returns False if stopped early."""
+    buf.should_stop = should_stop
+    try:
+        frames = miniaudio.stream_any(
+            _Source(buf),
+            source_format=miniaudio.FileFormat.MP3,
+            output_format=miniaudio.SampleFormat.SIGNED16,
+            nchannels=CHANNELS,
+            sample_rate=SAMPLE_RATE,
+            frames_to_read=FRAMES_PER_READ,
+        )
+        return _play_frames(frames, should_stop)
+    finally:
+        buf.close()
+
+
+def play_file(path, should_stop=None):
+    """Play an mp3 file through the same output path, so it can be cut short."""
+    frames = miniaudio.stream_file(
+        path,
+        output_format=miniaudio.SampleFormat.SIGNED16,
+        nchannels=CHANNELS,
+        sample_rate=SAMPLE_RATE,
+        frames_to_read=FRAMES_PER_READ,
+    )
+    return _play_frames(frames, should_stop)
@@ -0,0 +1,69 @@
+# modules/tts_text.py
+import re
+
+# Text segmentation in front of the TTS queue.
+#
+#   split_for_speech(): long replies (help text, note/reminder lists) are cut
+#     at sentence and line boundaries. The first piece is a single sentence so
+#     it can be synthesized and heard quickly; the rest are packed into pieces
+#     of up to MAX_CHUNK_CHARS so we don't pay a request per sentence.
+#   join_for_speech(): several short queued replies become one request.
+
+FIRST_CHUNK_CHARS = 120   # a first sentence longer than this is not split further
+MAX_CHUNK_CHARS = 400
+MERGE_MAX_CHARS = 160     # items shorter than this may be merged with neighbours
+
+_ABBREVIATIONS = {"mr", "mrs", "ms", "dr", "st", "jr", "sr", "vs", "etc", "e.g", "i.e", "a.m", "p.m", "no"}
+
+# sentence end: . ! ? or … (plus closing quotes/brackets) followed by whitespace
+_SENTENCE_END = re.compile(r"""(?<=[.!?…])["')\]]*\s+""")
+
+
+def _sentences(line):
+    out, start = [], 0
+    for m in _SENTENCE_END.finditer(line):
+        piece = line[start:m.start()].strip()
+        word = piece.rsplit(None, 1)[-1].rstrip(".").lower() if piece else ""
+        if word in _ABBREVIATIONS or word.isdigit() or (len(word) == 1 and word.isalpha()):
+            continue  # "Dr. Smith", "J. Doe", "1. call Mom"
+        out.append(line[start:m.end()].strip())
+        start = m.end()
+    tail = line[start:].strip()
+    if tail:
+        out.append(tail)
+    return out
+
+
+def split_for_speech(text):
+    """Pieces of text to synthesize in order; short text comes back as one piece."""
+    text = str(text or "").strip()
+    if len(text) <= FIRST_CHUNK_CHARS:
+        return [text] if text else []
+    sentences = []
+    for line in text.splitlines():
+        sentences.extend(_sentences(line))
+    if not sentences:
+        return []
+    pieces = [sentences[0]]
+    current = ""
+    for s in sentences[1:]:
+        if current and len(current) + 1 + len(s) > MAX_CHUNK_CHARS:
+            pieces.append(current)
+            current = ""
+        current = f"{current}\n{s}" if current else s
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def join_for_speech(texts):
+    """One utterance from several, keeping a pause between them."""
+    parts = []
+    for t in texts:
+        t = str(t).strip()
+        if not t:
+            continue
+        if t[-1] not in ".!?…":
+            t += "."
+        parts.append(t)
+    return " ".join(parts)
@@ -3,61 +3,69 @@ import threading
 import queue
 import time
 import os
-import tempfile
 import asyncio
+import tempfile
+from collections import OrderedDict
+
+from modules.tts_cache import TtsCache
+from modules import tts_stream
+from modules.voice_catalog import VoiceCatalog
+from modules.tts_text import split_for_speech, join_for_speech, MERGE_MAX_CHARS
+from modules.speech_queue import SpeechQueue, Utterance, PRIORITY_REPLY, PRIORITY_REMINDER, PRIORITY_EMERGENCY
+from modules.tts_backends import make_backends, rate_to_pct, edge_tts
+from modules.tts_metrics import SpeechMetrics, TRACE_PATH
 
-try:
-    import edge_tts  # pip install edge-tts
-    from playsound import playsound  # pip install playsound==1.2.2
-    _ok = True
-except Exception:
-    edge_tts = None
-    playsound = None
-    _ok = False
+# Backends are tried in this order for every utterance (see tts_backends.py).
+# TTS_BACKENDS=fake runs the whole pipeline without network or audio device.
+TTS_BACKENDS = os.getenv("TTS_BACKENDS", "edge,local")
+_backends = make_backends(TTS_BACKENDS.split(","))
 
-_tts_queue = queue.Queue()
 _worker_started = False
 _default_rate = 170  # our "human-ish" baseline
-_cached_voices = []  # list of dicts from edge-tts (ShortName, Gender, Locale, etc.)
+_catalog = VoiceCatalog()  # voices from edge-tts (ShortName, Gender, Locale, etc.)
 _current_voice = "en-US-AriaNeural"  # good default; we'll auto-switch to Zira/Guy if available
 
+# Synthesized clips are kept on disk keyed by (text, voice, rate), so repeated
+# phrases (reminder prompts, fixed replies, greetings) play without a trip to
+# Edge TTS. Least recently played clips go first once the budget is exceeded.
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", os.path.join("data", "tts_cache"))
+TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", str(50 * 1024 * 1024)))
+_tts_cache = None
+
 def is_available():
-    return _ok and (edge_tts is not None) and (playsound is not None)
+    return any(b.available() for b in _backends)
 
-def _rate_to_pct(rate_int: int) -> str:
-    """
-    Edge TTS expects rate as a percentage string like '+10%' or '-20%'.
-    We'll map 170 -> '+0%'. Clamp around 100–250.
-    """
-    try:
-        r = int(rate_int)
-    except Exception:
-        r = _default_rate
-    r = max(100, min(250, r))
-    pct = int(round((r - 170) / 170 * 100))  # rough mapping
-    sign = "+" if pct >= 0 else ""
-    return f"{sign}{pct}%"
+def set_backends(backends):
+    """Replace the backend list (names like 'edge' or backend objects).
+       Call before start_worker(); used by benchmarks and tests."""
+    global _backends
+    _backends = [make_backends([b])[0] if isinstance(b, str) else b for b in backends]
+
+def backend_stats():
+    """Per backend: available, failures so far, and whether it is cooling down."""
+    now = time.monotonic()
+    return {b.name: {"available": b.available(), "failures": b.failures,
+                     "cooling_down": b.failed_until > now} for b in _backends}
 
 def list_voices():
     """Returns a simplified list of (ShortName, Locale, Gender)."""
     out = []
-    for v in _cached_voices:
+    for v in _catalog.voices:
         out.append((v.get("ShortName", ""), v.get("Locale", ""), v.get("Gender", "")))
     return out
 
 def set_voice_by_name(name_substring: str):
-    """Pick a voice whose ShortName or FriendlyName contains the substring."""
-    global _current_voice
-    if not is_available() or not _cached_voices:
+    """Pick a voice by ShortName, FriendlyName or locale (exact), else the
+       first whose ShortName or FriendlyName contains the substring."""
+    global _current_voice, _voice_chosen
+    if not is_available():
+        return False
+    v = _catalog.find(name_substring)
+    if v is None:
         return False
-    ns = (name_substring or "").lower()
-    for v in _cached_voices:
-        short = v.get("ShortName", "")
-        friendly = v.get("FriendlyName", "")
-        if ns in short.lower() or ns in friendly.lower():
-            _current_voice = short
-            return True
-    return False
+    _current_voice = v["ShortName"]
+    _voice_chosen = True
+    return True
 
 def configure(rate=None, voice_hint=None):
     """Store defaults; worker uses them at speak-time."""
@@ -69,90 +77,489 @@ def configure(rate=None, voice_hint=None):
             pass
     # voice_hint handled in start_worker once voices are loaded
 
-async def _load_voices():
-    """Fetch and cache available voices from Edge TTS."""
-    global _cached_voices, _current_voice
+# ---------- Voice catalog ----------
+# The voice list is read from VOICE_CATALOG_PATH at startup (no network), and
+# fetched again in the background when it is missing or older than
+# VOICE_CATALOG_TTL_SECS. Speech never waits for it: until a catalog is
+# available the default voice is used.
+
+VOICE_CATALOG_PATH = os.path.join("data", "voices.json")
+VOICE_CATALOG_TTL_SECS = 7 * 24 * 3600
+PREFERRED_VOICES = ["en-US-ZiraNeural", "en-US-GuyNeural", "en-US-AriaNeural", "en-US-DavisNeural"]
+
+_voice_chosen = False  # the user (or a hint) picked a voice; don't override it
+
+def _use_catalog(catalog, voice_hint=None):
+    """Swap in a catalog and pick the voice: the hint if it matches, else a
+       familiar default (unless a voice was already chosen)."""
+    global _catalog, _current_voice, _voice_chosen
+    _catalog = catalog
+    if voice_hint and set_voice_by_name(voice_hint):
+        return
+    if _voice_chosen:
+        return
+    for p in PREFERRED_VOICES:
+        if catalog.get(p) is not None:
+            _current_voice = p
+            break
+
+async def _fetch_voices():
+    return await edge_tts.list_voices()
+
+def _refresh_catalog(voice_hint=None):
+    """Fetch the voice list from Edge TTS, save it, and use it."""
+    if edge_tts is None:
+        return False
     try:
-        _cached_voices = await edge_tts.list_voices()
-        # Prefer familiar voices if present
-        preferred = ["en-US-ZiraNeural", "en-US-GuyNeural", "en-US-AriaNeural", "en-US-DavisNeural"]
-        for p in preferred:
-            if any(v.get("ShortName") == p for v in _cached_voices):
-                _current_voice = p
-                break
+        voices = asyncio.run(_fetch_voices())
     except Exception:
-        _cached_voices = []
+        return False  # keep whatever we have; try again next start
+    catalog = VoiceCatalog(voices, fetched_at=time.time())
+    if not len(catalog):
+        return False
+    try:
+        catalog.save(VOICE_CATALOG_PATH)
+    except Exception:
+        pass
+    _use_catalog(catalog, voice_hint)
+    return True
 
-async def _synthesize_to_file(text: str, voice: str, rate_pct: str, out_path: str):
-    """Use Edge TTS to synthesize text to an mp3 file."""
-    communicator = edge_tts.Communicate(text=text, voice=voice, rate=rate_pct)
-    await communicator.save(out_path)
+def _load_catalog(voice_hint=None):
+    """Use the saved catalog now; refresh it in the background if needed."""
+    catalog = VoiceCatalog.load(VOICE_CATALOG_PATH)
+    if len(catalog):
+        _use_catalog(catalog, voice_hint)
+    if catalog.is_stale(VOICE_CATALOG_TTL_SECS):
+        # pass the hint only if it couldn't be applied from the saved list
+        hint = None if (_voice_chosen or not voice_hint) else voice_hint
+        threading.Thread(target=_refresh_catalog, kwargs={"voice_hint": hint}, daemon=True).start()
 
-def _worker(voice_hint=None):
-    # Each thread needs its own asyncio loop
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
+# Streaming playback (see tts_stream.py): on a cache miss, audio is played as
+# it arrives from Edge TTS instead of after the whole mp3 is written. Needs
+# miniaudio + sounddevice; TTS_STREAMING=0 turns it off. The streamed bytes
+# are also put in the cache unless the clip is longer than STREAM_CACHE_MAX_BYTES.
+TTS_STREAMING = os.getenv("TTS_STREAMING", "1").strip().lower() not in ("0", "false", "no", "off")
+STREAM_CACHE_MAX_BYTES = 2 * 1024 * 1024
+
+def _streaming():
+    return TTS_STREAMING and tts_stream.is_available()
+
+def _get_cache():
+    global _tts_cache
+    if _tts_cache is None:
+        _tts_cache = TtsCache(TTS_CACHE_DIR, TTS_CACHE_MAX_BYTES)
+    return _tts_cache
+
+_speech_counts = {"pieces": 0, "merged": 0, "synth_requests": 0, "preempted": 0, "backend_failures": 0}
+
+def speech_stats():
+    """Counters for the speech pipeline: pieces queued by speak(), pieces
+       merged into a neighbour, synthesis requests actually sent, replies
+       cut short or dropped for urgent speech, and failed backend attempts."""
+    return dict(_speech_counts)
+
+def tts_cache_stats():
+    """Hit/miss counters and size of the speech cache."""
+    return _get_cache().stats()
+
+class _Streamed(Exception):
+    """Raised inside _synthesize_with when the clip was already queued for playback."""
+
+def _mark_synthesized(group, backend, cache_hit):
+    now = time.monotonic()
+    for it in group:
+        it.t_synth_end = now
+        it.backend = backend.name
+        it.cache_hit = cache_hit
+
+def _synthesize_with(backend, text, voice, rate, priority, group):
+    """(clip path, is temp file) for text from one backend: its cached clip,
+       else a fresh synthesis. When the backend streams, the StreamBuffer is
+       queued for playback on the first audio chunk and _Streamed is raised;
+       failing before that raises the backend's error so the next backend can
+       be tried."""
+    rate_pct = rate_to_pct(rate)
+    cache_voice = backend.cache_voice(voice)
+    cache = _get_cache() if backend.cacheable else None
+    if cache is not None:
+        path = cache.get(text, cache_voice, rate_pct)
+        _count_prefetch_use((text, cache_voice, rate_pct), priority, path is not None)
+        if path is not None:
+            _mark_synthesized(group, backend, True)
+            return path, False
+    _speech_counts["synth_requests"] += 1
+
+    if backend.can_stream and _streaming():
+        buf = tts_stream.StreamBuffer()
+        queued = []
+
+        def on_first_chunk():
+            _mark_synthesized(group, backend, False)  # synthesis "ends" at the first audio
+            _play_queue.put((buf, group, priority, backend, False))
+            queued.append(True)
+
+        try:
+            data = backend.stream(text, voice, rate, buf, on_first_chunk, STREAM_CACHE_MAX_BYTES)
+        except Exception:
+            if not queued:
+                raise
+            data = None  # cut off mid-way: what arrived is already playing
+        if data and cache is not None:
+            cache.put_bytes(text, cache_voice, rate_pct, data)
+        raise _Streamed()
+
+    if cache is not None:
+        path = cache.put(text, cache_voice, rate_pct,
+                         lambda out: backend.synthesize(text, voice, rate, out))
+        _mark_synthesized(group, backend, False)
+        return path, False
+
+    fd, tmp = tempfile.mkstemp(suffix=backend.suffix)
+    os.close(fd)
+    try:
+        backend.synthesize(text, voice, rate, tmp)
+    except Exception:
+        _remove_quietly(tmp)
+        raise
+    _mark_synthesized(group, backend, False)
+    return tmp, True
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+# ---------- Latency metrics ----------
+# Every queued piece is timed from speak() to the end of playback (see
+# tts_metrics.py). speech_latency_stats() gives percentiles, queue depth and
+# error counts; TTS_TRACE=1 also appends one JSON line per piece to
+# logs/tts_trace.jsonl. TTS_SLO_SECS (default 1.5) is the reply latency target.
 
-    # Load voices once
-    loop.run_until_complete(_load_voices())
+TTS_TRACE = os.getenv("TTS_TRACE", "0").strip().lower() in ("1", "true", "yes", "on")
+_metrics = SpeechMetrics(trace_path=TRACE_PATH if TTS_TRACE else None)
 
-    # If user gave a hint (e.g., "zira"), try to set it
-    if voice_hint:
-        set_voice_by_name(voice_hint)
+def _fail(group, reason):
+    for it in group:
+        if it.error is None:
+            it.error = reason
+
+def enable_speech_trace(path=TRACE_PATH):
+    """Start (or, with path=None, stop) the JSON-lines speech trace."""
+    if path is None:
+        _metrics.disable_trace()
+    else:
+        _metrics.enable_trace(path)
+
+def speech_latency_stats(priority=None):
+    """Latency percentiles in seconds (queue_wait, synth, time_to_audio,
+       playback, total), errors by reason, reply SLO misses, and how many
+       pieces are waiting for synthesis and for playback."""
+    out = _metrics.stats(priority)
+    out["queue_depth"] = {"synthesis": len(_tts_queue), "playback": _play_queue.qsize()}
+    return out
+
+def speech_slo_ok():
+    """True while reply p90 time-to-audio is within TTS_SLO_SECS."""
+    st = _metrics.stats(PRIORITY_REPLY)
+    p90 = st["time_to_audio"]["p90"]
+    return p90 is None or p90 <= st["slo_secs"]
+
+# ---------- Worker pipeline ----------
+# Two stages so synthesis of the next utterance overlaps playback of the
+# current one:
+#
+#   speak() -> _tts_queue -> _worker (synthesize) -> _play_queue -> _player (play)
+#
+# _tts_queue is a SpeechQueue (speech_queue.py): emergency > reminder > reply
+# lanes, a bounded reply lane with drop-oldest, and de-duplication of pending
+# texts. A play item is a cached mp3 path or, when streaming, a StreamBuffer
+# that the worker keeps filling while the player is already playing from it.
+#
+# _play_queue is bounded (PLAYBACK_LOOKAHEAD), so the synthesizer runs at most
+# that many clips ahead. A play item carries the group of SpeechItems whose
+# text it speaks (several when short pieces were merged). Their done events
+# are only set once the clip has finished playing (or failed or was dropped),
+# so speak_blocking() still returns after the words were heard; that is also
+# when each item is handed to the latency metrics.
+#
+# Preemption: queuing urgent speech sets _preempt. The player then stops the
+# reply it is playing and drops replies already synthesized, until the urgent
+# item reaches it. Interrupted replies are not resumed: the rest of their
+# utterance is cancelled, so no fragment of them plays after the urgent item.
+# Cutting a clip short needs the miniaudio/sounddevice output path
+# (tts_stream); with plain playsound the current clip finishes first.
+
+PLAYBACK_LOOKAHEAD = 2
+_play_queue = queue.Queue(maxsize=PLAYBACK_LOOKAHEAD)
+_preempt = threading.Event()
+
+def _on_urgent():
+    _preempt.set()
+
+_tts_queue = SpeechQueue(on_urgent=_on_urgent, on_drop=_metrics.record)
+
+def _worker(voice_hint=None):
+    # Saved voice list (plus background refresh); the hint (e.g., "zira") is applied from it
+    _load_catalog(voice_hint)
 
     while True:
         item = _tts_queue.get()
         if item is None:
+            _play_queue.put(None)
             break
-        text, rate, done_evt = item
+        if item.utterance.cancelled and item.priority == PRIORITY_REPLY:
+            item.error = "preempted"  # rest of a reply that was cut off
+            _play_queue.put((None, [item], item.priority, None, False))
+            continue
+        voice = _current_voice
+        rate = item.rate if item.rate is not None else _default_rate
+        text, group, priority = item.text, [item], item.priority
+        play_item = (None, group, priority, None, False)
+        errors = []
         try:
-            rate_pct = _rate_to_pct(rate if rate is not None else _default_rate)
-            # temp mp3 file
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as tf:
-                tmp_path = tf.name
-            # synthesize
-            loop.run_until_complete(_synthesize_to_file(str(text), _current_voice, rate_pct, tmp_path))
-            # play (blocking)
-            playsound(tmp_path)
-        except Exception:
-            pass
+            text, group = _merge_waiting(item, rate_to_pct(rate), voice)
+            play_item = (None, group, priority, None, False)
+            started = time.monotonic()
+            for it in group:
+                it.t_synth_start = started
+            # per-utterance failover: first backend that can produce it wins
+            for backend in _backends:
+                if not backend.usable():
+                    continue
+                try:
+                    clip, temp = _synthesize_with(backend, text, voice, rate, priority, group)
+                except _Streamed:
+                    backend.mark_ok()
+                    play_item = None
+                    break
+                except Exception as e:
+                    backend.mark_failed()
+                    _speech_counts["backend_failures"] += 1
+                    _metrics.record_backend_error(backend.name, e)
+                    errors.append(f"{backend.name}={e!r}")
+                    continue
+                backend.mark_ok()
+                play_item = (clip, group, priority, backend, temp)
+                break
+            else:
+                _fail(group, "synth_failed: " + ("; ".join(errors) or "no usable backend"))
+        except Exception as e:
+            _fail(group, f"synth_failed: {e!r}")
+        # failures still go through so done events fire in order
+        if play_item is not None:
+            _play_queue.put(play_item)
+
+def _merge_waiting(item, rate_pct, voice):
+    """Fold short items waiting right behind this one (same lane and rate,
+       not already cached) into it, so a burst of tiny replies is one
+       synthesis request. Returns (text, items)."""
+    cache = _get_cache()
+    # the backend that will be tried first decides what "cached" means,
+    # keyed exactly as in _synthesize_with
+    backend = next((b for b in _backends if b.usable()), None)
+    if backend is None or not backend.cacheable:
+        cached = lambda t: False
+    else:
+        cache_voice = backend.cache_voice(voice)
+        cached = lambda t: cache.contains(t, cache_voice, rate_pct)
+    text, group = item.text, [item]
+    if len(text) >= MERGE_MAX_CHARS or cached(text):
+        return text, group
+    texts, total = [text], len(text)
+
+    def fits(nxt):
+        return (nxt.priority == item.priority and nxt.rate == item.rate
+                and total + len(nxt.text) <= MERGE_MAX_CHARS
+                and not cached(nxt.text))
+
+    while True:
+        nxt = _tts_queue.take_if(fits)
+        if nxt is None:
+            break
+        texts.append(nxt.text)
+        total += len(nxt.text)
+        group.append(nxt)
+        _speech_counts["merged"] += 1
+    if len(texts) > 1:
+        text = join_for_speech(texts)
+    return text, group
+
+def _player():
+    while True:
+        item = _play_queue.get()
+        if item is None:
+            break
+        clip, group, priority, backend, temp = item
+        try:
+            if priority > PRIORITY_REPLY:
+                _preempt.clear()  # the urgent speech has arrived
+            elif _preempt.is_set() or any(it.utterance.cancelled for it in group):
+                _speech_counts["preempted"] += 1
+                _cancel(group)
+                if isinstance(clip, tts_stream.StreamBuffer):
+                    clip.close()  # lets the worker move on to the urgent item
+                continue
+            if clip is None:
+                continue  # synthesis failed; the reason is on the items
+            stop = (lambda: _preempt.is_set()) if priority == PRIORITY_REPLY else None
+            started = time.monotonic()
+            for it in group:
+                it.t_play_start = started
+            if isinstance(clip, tts_stream.StreamBuffer):
+                # blocking, plays as chunks arrive
+                finished = tts_stream.play_stream(clip, should_stop=stop)
+            else:
+                finished = backend.play(clip, should_stop=stop)  # blocking
+            if not finished:
+                _speech_counts["preempted"] += 1
+                _cancel(group)
+        except Exception as e:
+            _fail(group, f"play_failed: {e!r}")
         finally:
-            try:
-                if os.path.exists(tmp_path):
-                    os.remove(tmp_path)
-            except Exception:
-                pass
-            if done_evt is not None:
+            if temp:
+                _remove_quietly(clip)
+            ended = time.monotonic()
+            for it in group:
+                if it.t_play_start is not None:
+                    it.t_play_end = ended
+                it.finish()
                 try:
-                    done_evt.set()
+                    _metrics.record(it)
                 except Exception:
                     pass
-        time.sleep(0.02)
+
+def _cancel(group):
+    """A reply was cut off: fail its pieces and drop the rest of its utterance."""
+    _fail(group, "preempted")
+    for it in group:
+        if not it.utterance.cancelled:
+            _tts_queue.cancel(it.utterance)
 
 def start_worker(default_rate=170, voice_hint=None):
-    """Start the single TTS worker once."""
+    """Start the TTS pipeline (synthesizer + player threads) once."""
     global _worker_started, _default_rate
     if not is_available() or _worker_started:
         return
     _default_rate = int(default_rate)
-    t = threading.Thread(target=_worker, kwargs={"voice_hint": voice_hint}, daemon=True)
-    t.start()
+    threading.Thread(target=_worker, kwargs={"voice_hint": voice_hint}, daemon=True).start()
+    threading.Thread(target=_player, daemon=True).start()
     _worker_started = True
 
-def speak(text, rate=None):
-    """Non-blocking: enqueue for worker thread."""
+def _enqueue(text, rate, done=None, priority=PRIORITY_REPLY):
+    """Queue text as sentence-sized pieces; done (if any) rides on the last."""
+    pieces = split_for_speech(text)
+    if not pieces:
+        if done is not None:
+            done.set()
+        return
+    _speech_counts["pieces"] += len(pieces)
+    utterance = Utterance()
+    for i, piece in enumerate(pieces):
+        last = i == len(pieces) - 1
+        _tts_queue.put(piece, rate, (done,) if (last and done is not None) else (), priority, utterance)
+
+def speak(text, rate=None, priority=PRIORITY_REPLY):
+    """Non-blocking: enqueue for worker thread.
+       priority: PRIORITY_REPLY, PRIORITY_REMINDER or PRIORITY_EMERGENCY."""
     if not is_available():
         return
-    _tts_queue.put((text, rate, None))
+    _enqueue(str(text), rate, priority=priority)
 
-def speak_blocking(text, rate=None, timeout=15.0):
+def speak_blocking(text, rate=None, timeout=15.0, priority=PRIORITY_REPLY):
     """Blocking, but still uses the worker. Useful for diagnostics."""
     if not is_available():
         return False
     done = threading.Event()
-    _tts_queue.put((text, rate, done))
+    _enqueue(str(text), rate, done, priority)
     return done.wait(timeout=timeout)
 
+# ---------- Prefetch ----------
+# prefetch(text) renders speech into the cache ahead of time on a background
+# thread, so that when the same text is spoken later (a reminder at its due
+# time) playback starts from disk. main.py registers it with the reminder
+# engine, which calls it a few minutes before each reminder is due.
+#
+# Hit rate: every spoken piece that was prefetched, and every reminder-priority
+# piece, counts as a hit if its audio was already cached and a miss otherwise.
+
+PREFETCH_MAX_PENDING = 32
+_PREFETCHED_MAX = 256
+
+_prefetch_queue = queue.Queue(maxsize=PREFETCH_MAX_PENDING)
+_prefetch_started = False
+_prefetch_lock = threading.Lock()
+_prefetched = OrderedDict()   # cache key rendered by prefetch and not spoken yet
+_prefetch_counts = {"requested": 0, "rendered": 0, "already_cached": 0, "failed": 0,
+                    "dropped": 0, "hits": 0, "misses": 0}
+
+def prefetch(text, rate=None):
+    """Render text into the speech cache in the background (never blocks).
+       Returns False if speech is unavailable or the prefetch queue is full."""
+    global _prefetch_started
+    if not is_available():
+        return False
+    with _prefetch_lock:
+        if not _prefetch_started:
+            threading.Thread(target=_prefetcher, daemon=True, name="tts-prefetch").start()
+            _prefetch_started = True
+    ok = True
+    for piece in split_for_speech(str(text)):
+        _prefetch_counts["requested"] += 1
+        try:
+            _prefetch_queue.put_nowait((piece, rate))
+        except queue.Full:
+            _prefetch_counts["dropped"] += 1
+            ok = False
+    return ok
+
+def _prefetcher():
+    while True:
+        text, rate = _prefetch_queue.get()
+        rate = rate if rate is not None else _default_rate
+        rate_pct = rate_to_pct(rate)
+        voice = _current_voice
+        cache = _get_cache()
+        for backend in _backends:
+            if not backend.cacheable or not backend.usable():
+                continue
+            cache_voice = backend.cache_voice(voice)
+            key = (text, cache_voice, rate_pct)
+            try:
+                if cache.contains(text, cache_voice, rate_pct):
+                    _prefetch_counts["already_cached"] += 1
+                else:
+                    cache.put(text, cache_voice, rate_pct,
+                              lambda out: backend.synthesize(text, voice, rate, out))
+                    _prefetch_counts["rendered"] += 1
+            except Exception:
+                backend.mark_failed()
+                continue
+            with _prefetch_lock:
+                _prefetched[key] = True
+                while len(_prefetched) > _PREFETCHED_MAX:
+                    _prefetched.popitem(last=False)
+            break
+        else:
+            _prefetch_counts["failed"] += 1
+
+def _count_prefetch_use(key, priority, cached):
+    with _prefetch_lock:
+        was_prefetched = _prefetched.pop(key, None) is not None
+    if was_prefetched or priority == PRIORITY_REMINDER:
+        _prefetch_counts["hits" if cached else "misses"] += 1
+
+def prefetch_stats():
+    """Prefetch counters plus hit_rate = hits / (hits + misses)."""
+    out = dict(_prefetch_counts)
+    used = out["hits"] + out["misses"]
+    out["hit_rate"] = (out["hits"] / used) if used else 0.0
+    return out
+
+def speech_queue_stats():
+    """Pending items per lane, replies dropped, duplicates folded."""
+    return _tts_queue.stats()
+
 def beep():
     try:
         import winsound
@@ -0,0 +1,80 @@
+# modules/voice_catalog.py
+import json
+import time
+
+from modules.fileio import write_json_atomic
+
+# The Edge TTS voice list, kept on disk so startup doesn't wait on the network.
+#
+# The file holds {"fetched_at": <epoch secs>, "voices": [...]} exactly as
+# edge_tts.list_voices() returned them. voice.py loads it at startup, speaks
+# with it straight away, and refreshes it in the background once it is older
+# than the TTL (or missing).
+#
+# Lookups are indexed: ShortName and FriendlyName map straight to a voice and
+# Locale to its voices; only a partial name ("aria") falls back to a scan.
+
+
+class VoiceCatalog:
+    """Edge TTS voices with lookup by ShortName, FriendlyName and Locale."""
+
+    __slots__ = ("voices", "fetched_at", "_by_short", "_by_friendly", "_by_locale")
+
+    def __init__(self, voices=(), fetched_at=0.0):
+        self.voices = [v for v in voices if isinstance(v, dict) and v.get("ShortName")]
+        self.fetched_at = float(fetched_at or 0.0)
+        self._by_short = {}
+        self._by_friendly = {}
+        self._by_locale = {}
+        for v in self.voices:
+            self._by_short.setdefault(v["ShortName"].casefold(), v)
+            friendly = v.get("FriendlyName")
+            if friendly:
+                self._by_friendly.setdefault(friendly.casefold(), v)
+            locale = v.get("Locale")
+            if locale:
+                self._by_locale.setdefault(locale.casefold(), []).append(v)
+
+    def __len__(self):
+        return len(self.voices)
+
+    @classmethod
+    def load(cls, path):
+        """Catalog from disk, or an empty one if missing/unreadable."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return cls(data.get("voices") or [], data.get("fetched_at") or 0.0)
+        except Exception:
+            return cls()
+
+    def save(self, path):
+        write_json_atomic(path, {"fetched_at": self.fetched_at, "voices": self.voices})
+
+    def is_stale(self, ttl_secs, now=None):
+        if not self.voices:
+            return True
+        return ((now if now is not None else time.time()) - self.fetched_at) > ttl_secs
+
+    def get(self, short_name):
+        return self._by_short.get((short_name or "").casefold())
+
+    def by_locale(self, locale):
+        return list(self._by_locale.get((locale or "").casefold(), ()))
+
+    def find(self, query):
+        """Best voice for what the user said: exact ShortName, FriendlyName or
+           Locale first, then the first voice whose names contain it."""
+        q = (query or "").strip().casefold()
+        if not q:
+            return None
+        v = self._by_short.get(q) or self._by_friendly.get(q)
+        if v is not None:
+            return v
+        in_locale = self._by_locale.get(q)
+        if in_locale:
+            return in_locale[0]
+        for v in self.voices:
+            if q in v["ShortName"].casefold() or q in (v.get("FriendlyName") or "").casefold():
+                return v
+        return None
@@ -0,0 +1,21 @@
+import pytest
+
+from modules.contact_index import ContactIndex
+from modules.profile_model import Contact
+
+
+def _index(*names):
+    return ContactIndex([Contact(name=n) for n in names])
+
+
+@pytest.mark.parametrize("names, query, expected", [
+    (("John", "Mary Jones"), "jon", "John"),            # fuzzy beats a later-word prefix
+    (("John", "Mary Jones"), "john", "John"),           # exact
+    (("John", "Mary Jones"), "mar", "Mary Jones"),      # prefix of the full name
+    (("Johnathan", "Mary Jones"), "jon", "Mary Jones"),  # nothing closer: word prefix
+    (("Jan",), "jon", "Jan"),
+    (("John", "Joan"), "jo", None),                     # ambiguous prefix
+])
+def test_find_ranks_candidates(names, query, expected):
+    c = _index(*names).find(query)
+    assert (c.name if c else None) == expected
@@ -0,0 +1,14 @@
+from modules import memory
+from modules.profile_model import Profile
+
+
+def test_failed_write_keeps_changes_pending(tmp_path, monkeypatch):
+    monkeypatch.setattr(memory, "PROFILE_PATH", str(tmp_path / "missing-dir" / "user_profile.json"))
+    monkeypatch.setattr(memory, "SAVE_RETRY_SECS", 3600)
+    profile = Profile()
+    memory.set_name(profile, "ada")
+    assert memory.flush_profile() is False      # directory doesn't exist yet
+
+    (tmp_path / "missing-dir").mkdir()
+    assert memory.flush_profile() is True       # retried, not lost
+    assert '"Ada"' in (tmp_path / "missing-dir" / "user_profile.json").read_text(encoding="utf-8")
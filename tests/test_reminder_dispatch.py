@@ -0,0 +1,31 @@
+import threading
+
+from modules import reminders
+
+
+def test_hung_callbacks_do_not_delay_the_next_reminder(monkeypatch):
+    monkeypatch.setattr(reminders, "DISPATCH_MAX_LIVE", 8)
+    hang = threading.Event()
+    fired = threading.Event()
+    try:
+        for _ in range(4):
+            reminders._dispatch(hang.wait, ())
+        reminders._dispatch(fired.set, ())
+        assert fired.wait(1.0)
+    finally:
+        hang.set()
+
+
+def test_live_callback_threads_are_capped(monkeypatch):
+    monkeypatch.setattr(reminders, "DISPATCH_MAX_LIVE", 2)
+    hang = threading.Event()
+    fired = threading.Event()
+    try:
+        reminders._dispatch(hang.wait, ())
+        reminders._dispatch(hang.wait, ())
+        reminders._dispatch(fired.set, ())
+        assert not fired.wait(0.2)      # waits for a thread to finish
+        hang.set()
+        assert fired.wait(1.0)
+    finally:
+        hang.set()
@@ -0,0 +1,34 @@
+import pytest
+
+from modules.reminders import ReminderCommand, parse_reminder_command, reminder_usage_hint
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("remind me to call Mom", ReminderCommand("text", "call Mom", None, None, None)),
+    ("remind me in 10 minutes to drink water", ReminderCommand("in", "drink water", 600, None, None)),
+    ("remind me in an hour to stretch", ReminderCommand("in", "stretch", 3600, None, None)),
+    ("remind me in 2 hours and 30 minutes to x", ReminderCommand("in", "x", 9000, None, None)),
+    ("remind me in 1 hour, 15 mins to x", ReminderCommand("in", "x", 4500, None, None)),
+    ("remind me in 1 day 2 hours to x", ReminderCommand("in", "x", 93600, None, None)),
+    ("remind me at 8:30 pm to take medicine", ReminderCommand("at", "take medicine", None, "8:30 pm", None)),
+    ("remind me on fri at 9 am to call the doctor", ReminderCommand("on", "call the doctor", None, "9 am", "friday")),
+    ("remind me every day at 8 am to take medicine", ReminderCommand("daily", "take medicine", None, "8 am", None)),
+    ("remind me every mondays at 7 pm to call Mom", ReminderCommand("weekly", "call Mom", None, "7 pm", "monday")),
+    ("  Remind   me in 5 secs   to  sit up ", ReminderCommand("in", "sit up", 5, None, None)),
+])
+def test_parse(text, expected):
+    assert parse_reminder_command(text) == expected
+
+
+@pytest.mark.parametrize("text, hint", [
+    ("remind me at 8 pm to", "Try: remind me at 8:30 pm to take medicine"),
+    ("remind me in 10 to x", "Try: remind me in 10 minutes to drink water (seconds, minutes, hours or days)"),
+    ("remind me every day at", "Try: remind me every day at 8 am to take medicine"),
+    ("remind me every monday to x", "Try: remind me every monday at 7 pm to call Mom"),
+    ("remind me on friday to x", "Try: remind me on friday at 9 am to call the doctor"),
+    ("remind me", "Remind you to… what? Try: remind me to call Mom"),
+    ("remind me to", "Remind you to… what? Try: remind me to call Mom"),
+])
+def test_unparsed_gets_hint(text, hint):
+    assert parse_reminder_command(text) is None
+    assert reminder_usage_hint(text.lower()) == hint
@@ -0,0 +1,9 @@
+from modules.reminder_sim import run_simulation
+
+
+def test_lateness_reflects_scheduler_work():
+    fast = run_simulation(users=20, days=3, cost_scale=1.0)
+    slow = run_simulation(users=20, days=3, cost_scale=1e6)
+    assert fast["firings"] == slow["firings"] > 0
+    assert fast["lateness_max"] > 0.0
+    assert slow["lateness_mean"] > fast["lateness_mean"]
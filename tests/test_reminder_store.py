@@ -0,0 +1,61 @@
+from modules.reminder_store import JournalStore
+
+
+def _store(tmp_path):
+    return JournalStore(str(tmp_path / "reminders.json"), str(tmp_path / "reminders.journal"), fsync=False)
+
+
+def test_torn_only_journal_line_does_not_swallow_next_append(tmp_path):
+    store = _store(tmp_path)
+    store.add({"id": "a", "task": "a"})
+    store.compact()
+    # crash mid-append: the only journal line is torn
+    with open(tmp_path / "reminders.journal", "w", encoding="utf-8") as f:
+        f.write('{"op": "add", "remin')
+
+    store = _store(tmp_path)
+    store.add({"id": "b", "task": "b"})
+
+    store = _store(tmp_path)
+    assert sorted(r["id"] for r in store.all()) == ["a", "b"]
+
+
+def test_torn_tail_after_good_lines_is_dropped(tmp_path):
+    store = _store(tmp_path)
+    store.add({"id": "a", "task": "a"})
+    with open(tmp_path / "reminders.journal", "a", encoding="utf-8") as f:
+        f.write('{"op": "remove", "i')
+
+    store = _store(tmp_path)
+    assert [r["id"] for r in store.all()] == ["a"]
+    store.add({"id": "c", "task": "c"})
+    store = _store(tmp_path)
+    assert sorted(r["id"] for r in store.all()) == ["a", "c"]
+
+
+def test_sqlite_same_id_for_two_users_does_not_collide(tmp_path):
+    from modules.reminder_store import SqliteStore
+    db = str(tmp_path / "reminders.db")
+    alice = SqliteStore(db, user_id="alice")
+    bob = SqliteStore(db, user_id="bob")
+    alice.replace_all([{"id": "med1", "task": "alice pill"}])
+    bob.replace_all([{"id": "med1", "task": "bob pill"}])
+    bob.add({"id": "med1", "task": "bob pill, later"})
+    assert [r["task"] for r in alice.all()] == ["alice pill"]
+    assert [r["task"] for r in bob.all()] == ["bob pill, later"]
+
+
+def test_sqlite_rebuilds_table_with_global_unique_id(tmp_path):
+    import sqlite3
+    from modules.reminder_store import SqliteStore
+    db = str(tmp_path / "old.db")
+    con = sqlite3.connect(db)
+    con.execute("CREATE TABLE reminders (seq INTEGER PRIMARY KEY AUTOINCREMENT, id TEXT NOT NULL UNIQUE, "
+                "user_id TEXT NOT NULL DEFAULT 'default', task TEXT NOT NULL, remind_at TEXT, due REAL, repeat TEXT)")
+    con.execute("INSERT INTO reminders (id, user_id, task) VALUES ('med1', 'alice', 'alice pill')")
+    con.commit()
+    con.close()
+
+    alice = SqliteStore(db, user_id="alice")
+    SqliteStore(db, user_id="bob").add({"id": "med1", "task": "bob pill"})
+    assert [r["task"] for r in alice.all()] == ["alice pill"]
@@ -0,0 +1,77 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from modules.reminder_table import ReminderTable  # noqa: E402
+
+
+@pytest.mark.parametrize("rem_id", ["0123456789ab", "0x12345678ab", "ABCDEF012345", " 12345678ab ", "+0123456789a", "med1"])
+def test_ids_round_trip(rem_id):
+    table = ReminderTable.from_reminders([{"id": rem_id, "task": "t", "remind_at": None, "repeat": None}])
+    assert table.to_reminders()[0]["id"] == rem_id
+
+
+from datetime import datetime, timedelta  # noqa: E402
+
+from modules.reminder_table import NO_DUE, local_seconds  # noqa: E402
+
+T0 = datetime(2025, 3, 1, 8, 0, 0)
+
+
+def _rem(rem_id, at, repeat=None, task="t"):
+    return {"id": rem_id, "task": task, "remind_at": at.strftime("%Y-%m-%d %H:%M:%S") if at else None,
+            "repeat": repeat}
+
+
+def test_reschedule_catches_up_to_the_first_occurrence_after_now():
+    table = ReminderTable.from_reminders([
+        _rem("daily", T0, "daily"),
+        _rem("weekly", T0, "weekly:Saturday"),
+        _rem("once", T0),
+        _rem("exact", T0 + timedelta(days=2, hours=12), "daily"),
+    ])
+    now = local_seconds(T0 + timedelta(days=2, hours=12))
+    times = table.reschedule([0, 1, 2, 3], now)
+    assert times.tolist() == [3, 1, 1, 1]
+    assert table.row(0)["remind_at"] == "2025-03-04 08:00:00"
+    assert table.row(1)["remind_at"] == "2025-03-08 08:00:00"
+    assert table.row(3)["remind_at"] == "2025-03-04 20:00:00"   # due exactly at now: next one
+    assert [r["id"] for r in table.to_reminders()] == ["daily", "weekly", "exact"]
+
+
+def test_due_rows_and_due_between():
+    table = ReminderTable.from_reminders([
+        _rem("a", T0 + timedelta(hours=2)),
+        _rem("b", T0),
+        _rem("untimed", None),
+        _rem("c", T0 + timedelta(hours=1)),
+    ])
+    assert table.due_rows(local_seconds(T0) - 1).tolist() == []
+    assert table.due_rows(local_seconds(T0 + timedelta(hours=1))).tolist() == [1, 3]
+    assert table.due_between(local_seconds(T0), local_seconds(T0 + timedelta(hours=2))).tolist() == [1, 3]
+    assert table.next_due() == local_seconds(T0)
+    table.remove([1])
+    assert table.due_rows(local_seconds(T0 + timedelta(hours=1))).tolist() == [3]
+    assert table.next_due() == local_seconds(T0 + timedelta(hours=1))
+    assert NO_DUE not in table.due_between(0, NO_DUE).tolist()
+
+
+def test_engine_table_matches_the_store(tmp_path):
+    from modules.reminder_store import JournalStore
+    from modules.reminders import ReminderEngine
+
+    def open_store(user_id):
+        return JournalStore(str(tmp_path / f"{user_id}.json"), str(tmp_path / f"{user_id}.journal"), fsync=False)
+
+    engine = ReminderEngine(store_factory=open_store, autostart=False)
+    engine.add(_rem(None, T0, "daily", task="take medicine"), "alice")
+    engine.add(_rem(None, T0 + timedelta(days=3), task="dentist"), "alice")
+    engine.add(_rem(None, T0, task="bob's"), "bob")
+
+    until = T0 + timedelta(days=1)
+    table = engine.table("alice")
+    rows = table.due_rows(local_seconds(until))
+    assert sorted(r["id"] for r in table.rows(rows)) == sorted(r["id"] for r in engine.due("alice", until=until))
+    assert table.reschedule(rows, local_seconds(until)).tolist() == [2]
+    assert [r["task"] for r in table.to_reminders()] == ["take medicine", "dentist"]
+    assert table.row(rows[0])["remind_at"] == "2025-03-03 08:00:00"
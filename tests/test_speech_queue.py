@@ -0,0 +1,47 @@
+import threading
+
+from modules.speech_queue import SpeechQueue, Utterance, PRIORITY_REPLY, PRIORITY_EMERGENCY
+
+
+def _drain(q):
+    out = []
+    while len(q):
+        out.append(q.get().text)
+    return out
+
+
+def test_long_reply_keeps_its_beginning():
+    q = SpeechQueue(reply_max_pending=8)
+    utt = Utterance()
+    for i in range(13):
+        q.put(f"piece {i}", utterance=utt)
+    assert _drain(q) == [f"piece {i}" for i in range(13)]
+    assert q.dropped == 0
+
+
+def test_oldest_whole_reply_is_dropped():
+    dropped = []
+    q = SpeechQueue(reply_max_pending=2, on_drop=dropped.append)
+    done = threading.Event()
+    first = Utterance()
+    q.put("a1", utterance=first)
+    q.put("a2", done_evts=(done,), utterance=first)
+    q.put("b1", utterance=Utterance())
+    q.put("c1", utterance=Utterance())
+    assert _drain(q) == ["b1", "c1"]
+    assert [it.text for it in dropped] == ["a1", "a2"]
+    assert done.is_set()
+
+
+def test_cancel_drops_rest_of_reply_only():
+    q = SpeechQueue()
+    reply, other = Utterance(), Utterance()
+    for i in range(3):
+        q.put(f"r{i}", utterance=reply)
+    q.put("o1", utterance=other)
+    q.put("help", priority=PRIORITY_EMERGENCY)
+    assert q.get().text == "help"
+    assert q.cancel(reply) == 3
+    assert reply.cancelled
+    assert _drain(q) == ["o1"]
+    assert q.stats()["pending_replies"] == 0